@@ -1,5 +1,7 @@
+import asyncio
 import platform
 import os
+import re
 import sqlite3
 import logging
 import traceback
@@ -8,8 +10,9 @@ import sys
 
 import psutil
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 # Debug logging control
@@ -18,12 +21,14 @@ DEBUG_ENABLED = os.environ.get("DEBUG", "false").lower() in ("true", "1", "yes")
 from backend.api.models.response import StableDiffusionResponse
 from backend.base64_image import base64_image_to_pil, pil_image_to_base64_str
 from backend.device import get_device_name
+from backend.image_saver import RESULTS_INDEX_NAME
 from backend.models.device import DeviceInfo
 from backend.models.lcmdiffusion_setting import DiffusionTask, LCMDiffusionSetting
 from constants import APP_VERSION, DEVICE
 from context import Context
 from models.interface_types import InterfaceType
 from paths import FastStableDiffusionPaths
+from utils import IMAGE_MAGIC, atomic_save_image, format_timestamp
 from state import get_settings
 from backend.queue_db import (
     init_db as init_queue_db,
@@ -45,6 +50,12 @@ import json
 import json
 import shutil
 import urllib.parse
+from functools import lru_cache
+
+import orjson
+
+# Generation id prefix of a result filename ("<uuid>-<n>.png"); sidecars are "<uuid>.json"
+_UUID_RE = re.compile(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})')
 
 app_settings = get_settings()
 app = FastAPI(
@@ -193,6 +204,93 @@ async def generate(diffusion_config: LCMDiffusionSetting) -> StableDiffusionResp
     )
 
 
+@lru_cache(maxsize=512)
+def _load_sidecar(json_path: str, mtime_ns: int) -> dict:
+    """Parse a result sidecar JSON. Cached per (path, mtime) since sidecars are written once."""
+    with open(json_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def _header_ok(path: str, size: int) -> bool:
+    """True when a result file is non-trivial and starts with a known image signature."""
+    if size <= 16:
+        return False
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            prefix = os.read(fd, 8)
+        finally:
+            os.close(fd)
+    except OSError:
+        return False
+    return prefix.startswith(IMAGE_MAGIC)
+
+
+# Parsed results index.jsonl records keyed by generation id. ImageSaver only appends, so
+# each refresh parses just the bytes added since the last one.
+_results_index = {"path": None, "ino": None, "offset": 0, "records": {}}
+_results_index_lock = threading.Lock()
+# Compact the index once this many records point at images that are gone
+_INDEX_COMPACT_MIN_DEAD = 256
+
+
+def _read_results_index(index_path: str) -> dict:
+    """Return {generation id: record} for the results index, reading only new lines."""
+    with _results_index_lock:
+        state = _results_index
+        st = os.stat(index_path)
+        if state["path"] != index_path or state["ino"] != st.st_ino or st.st_size < state["offset"]:
+            # First read, or the file was replaced/truncated (e.g. compacted)
+            state.update(path=index_path, ino=st.st_ino, offset=0, records={})
+        if st.st_size > state["offset"]:
+            with open(index_path, "rb") as f:
+                f.seek(state["offset"])
+                chunk = f.read(st.st_size - state["offset"])
+            # A trailing line without its newline is still being appended; pick it up next time
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                state["records"][record.get("id")] = record
+            state["offset"] += len(complete)
+        return state["records"]
+
+
+def _compact_results_index(index_path: str, live_ids: set) -> None:
+    """Rewrite the index without records whose images no longer exist.
+
+    Runs only when enough dead records have piled up. A record appended while the
+    rewrite is in flight can be lost; listings then fall back to that generation's
+    sidecar, so the race costs one extra file read rather than metadata.
+    """
+    with _results_index_lock:
+        state = _results_index
+        if state["path"] != index_path:
+            return
+        records = state["records"]
+        dead = [gen_id for gen_id in records if gen_id not in live_ids]
+        if len(dead) < _INDEX_COMPACT_MIN_DEAD:
+            return
+        for gen_id in dead:
+            del records[gen_id]
+        tmp_path = index_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for record in records.values():
+                    f.write(orjson.dumps(record) + b"\n")
+            # Skip the swap if ImageSaver appended since our last read
+            if os.stat(index_path).st_size != state["offset"]:
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, index_path)
+            st = os.stat(index_path)
+            state.update(ino=st.st_ino, offset=st.st_size)
+        except OSError:
+            logging.exception("Failed to compact results index %s", index_path)
+
+
 def start_web_server(port: int = 8000):
     uvicorn.run(
         app,
@@ -201,12 +299,49 @@ def start_web_server(port: int = 8000):
     )
 
 
+@app.get(
+    "/api/results/events",
+    description="Server-Sent Events stream of results directory changes",
+    summary="Watch generated results",
+)
+async def results_events(request: Request):
+    """Emit the results directory mtime whenever it changes, with periodic keep-alives.
+
+    Lets the web UI refresh on new results instead of polling /api/results/paged.
+    """
+    path = app_settings.settings.generated_images.path or FastStableDiffusionPaths.get_results_path()
+
+    async def _stream():
+        last = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != last:
+                last = mtime
+                idle = 0.0
+                yield f"data: {mtime}\n\n"
+            elif idle >= 15:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(0.5)
+            idle += 0.5
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get(
     "/api/results/paged",
     description="List generated result files (paginated)",
     summary="List generated results (paged)",
 )
-async def list_results_paged(page: int = 0, size: int = 20):
+async def list_results_paged(request: Request, response: Response, page: int = 0, size: int = 20):
     """Return paginated results. Uses a small in-memory cache with TTL and directory-mtime invalidation."""
     try:
         path = app_settings.settings.generated_images.path
@@ -218,15 +353,32 @@ async def list_results_paged(page: int = 0, size: int = 20):
 
         # init cache on app
         if not hasattr(app, "_results_cache"):
-            app._results_cache = {"dir_mtime": 0, "timestamp": 0.0, "ttl": 3.0, "pages": {}}
+            app._results_cache = {"dir_mtime": 0, "timestamp": 0.0, "ttl": 3.0, "pages": {}, "entries": None}
 
         cache = app._results_cache
-        dir_mtime = os.stat(path).st_mtime
+        dir_mtime = os.stat(path).st_mtime_ns
+        index_path = os.path.join(path, RESULTS_INDEX_NAME)
+        try:
+            idx_stat = os.stat(index_path)
+            index_sig = (idx_stat.st_size, idx_stat.st_mtime_ns)
+        except OSError:
+            index_sig = (0, 0)
 
         # invalidate cache if directory changed
         if cache.get("dir_mtime") != dir_mtime:
             cache["dir_mtime"] = dir_mtime
             cache["pages"].clear()
+            cache["entries"] = None
+        # Index appends don't touch the directory mtime but change page metadata
+        if cache.get("index_sig") != index_sig:
+            cache["index_sig"] = index_sig
+            cache["pages"].clear()
+
+        # Weak validator over the same generation as the page cache: directory plus index
+        etag = f'W/"{dir_mtime:x}-{index_sig[0]:x}-{index_sig[1]:x}-{page}-{size}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
 
         key = f"{page}:{size}"
         now = time.time()
@@ -234,18 +386,32 @@ async def list_results_paged(page: int = 0, size: int = 20):
         if entry and (now - entry["timestamp"] < cache["ttl"]):
             return entry["data"]
 
-        # Only list image files (jpg, png)
-        all_entries = [
-            e for e in os.listdir(path) 
-            if os.path.isfile(os.path.join(path, e)) 
-            and (e.lower().endswith('.jpg') or e.lower().endswith('.png') or e.lower().endswith('.jpeg'))
-        ]
-        all_entries.sort(key=lambda e: os.stat(os.path.join(path, e)).st_mtime, reverse=True)
+        # Only list image files (jpg, png). The sorted listing is reused across pages
+        # until the directory mtime changes.
+        all_entries = cache.get("entries")
+        if all_entries is None:
+            with os.scandir(path) as it:
+                scanned = [
+                    (e.name, e.stat().st_mtime) for e in it
+                    if e.name.lower().endswith(('.jpg', '.png', '.jpeg')) and e.is_file()
+                ]
+            scanned.sort(key=lambda t: t[1], reverse=True)
+            all_entries = [name for name, _ in scanned]
+            cache["entries"] = all_entries
+            # Listing just changed: drop index records for generations whose images are gone
+            live_ids = {m.group(1) for m in map(_UUID_RE.match, all_entries) if m}
+            _compact_results_index(index_path, live_ids)
 
         start = page * size
         end = start + size
         page_entries = all_entries[start:end]
 
+        # One read of the index covers most entries; per-file sidecars are the fallback.
+        try:
+            index = _read_results_index(index_path)
+        except OSError:
+            index = {}
+
         results = []
         for entry_name in page_entries:
             try:
@@ -253,20 +419,19 @@ async def list_results_paged(page: int = 0, size: int = 20):
                 stat = os.stat(full)
                 
                 # Extract UUID from filename and look for corresponding JSON
-                import re
-                base_name = os.path.splitext(entry_name)[0]
                 # Match UUID pattern in filename (with or without batch suffix)
-                uuid_match = re.match(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', base_name)
+                uuid_match = _UUID_RE.match(entry_name)
                 meta = {}
                 if uuid_match:
                     uuid = uuid_match.group(1)
                     json_path = os.path.join(path, uuid + ".json")
-                    if os.path.exists(json_path):
+                    if uuid in index:
+                        meta = dict(index[uuid].get("meta") or {})
+                    elif os.path.exists(json_path):
                         # Retry logic to handle race conditions with file writes
                         for attempt in range(3):
                             try:
-                                with open(json_path, "r", encoding="utf-8") as f:
-                                    meta = json.load(f)
+                                meta = dict(_load_sidecar(json_path, os.stat(json_path).st_mtime_ns))
                                 if DEBUG_ENABLED:
                                     print(f"[DEBUG] Loaded JSON for {entry_name}: UUID={uuid}, keys={list(meta.keys())}, prompt={meta.get('prompt', 'N/A')[:50]}")
                                 break
@@ -290,6 +455,7 @@ async def list_results_paged(page: int = 0, size: int = 20):
                         "url": f"/results/{entry_name}",
                         "size": stat.st_size,
                         "mtime": stat.st_mtime,
+                        "header_ok": _header_ok(full, stat.st_size),
                         "meta": meta,
                         "review": None,
                     }
@@ -361,6 +527,46 @@ async def enqueue_api(diffusion_config: LCMDiffusionSetting):
     return {"job_id": job_id, "status": "queued", "payload_json_path": json_path}
 
 
+# Thumbnail widths served by the thumb endpoint; 256 and 600 are the web UI's gallery and slot sizes
+_THUMB_WIDTHS = (128, 256, 600, 1024)
+
+
+@app.get(
+    "/api/results/{name}/thumb",
+    description="JPEG thumbnail of a generated result, cached under <results>/.thumbs",
+    summary="Result thumbnail",
+)
+def result_thumb_api(name: str, w: int = 256):
+    from fastapi.responses import FileResponse
+    from PIL import Image
+
+    name = os.path.basename(urllib.parse.unquote(name))
+    # Snap to a fixed size so each result has at most len(_THUMB_WIDTHS) cached thumbnails
+    w = next((size for size in _THUMB_WIDTHS if size >= w), _THUMB_WIDTHS[-1])
+    path = app_settings.settings.generated_images.path or FastStableDiffusionPaths.get_results_path()
+    full = os.path.join(path, name)
+    try:
+        src_mtime = os.stat(full).st_mtime
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"Result file not found: {name}")
+
+    # Same .thumbs directory the web UI uses, so sibling .jpg files never show up as results
+    thumb = os.path.join(path, ".thumbs", f"{name}.w{w}.jpg")
+    try:
+        fresh = os.stat(thumb).st_mtime >= src_mtime
+    except OSError:
+        fresh = False
+    if not fresh:
+        try:
+            with Image.open(full) as im:
+                im.thumbnail((w, w), Image.LANCZOS)
+                if not atomic_save_image(im.convert("RGB"), thumb, jpeg_quality=80):
+                    raise OSError("thumbnail save failed")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to build thumbnail: {e}")
+    return FileResponse(thumb, media_type="image/jpeg", headers={"Cache-Control": "max-age=3600"})
+
+
 @app.post(
     "/api/results/{name}/archive",
     description="Archive a generated result file",
@@ -423,18 +629,30 @@ async def archive_result_api(name: str):
     return {"archived": True, "path": dest}
 
 
+def _display_job(job: dict) -> dict:
+    """Queue job with UI-ready *_display timestamp strings and the result truncated to 200 chars."""
+    out = dict(job)
+    for key in ("created_at", "started_at", "finished_at"):
+        ts = job.get(key)
+        out[f"{key}_display"] = format_timestamp(float(ts)) if ts else ""
+    out["result"] = (job.get("result") or "")[:200]
+    return out
+
+
 @app.get(
     "/api/queue",
     description="List queue jobs",
     summary="List queue",
 )
-async def list_queue_api(status: str = None):
+async def list_queue_api(status: str = None, format: str = None):
     path = app_settings.settings.generated_images.path
     if not path:
         path = FastStableDiffusionPaths.get_results_path()
     db_file = os.path.join(path, "queue.db")
     init_queue_db(db_file)
     jobs = list_queue_jobs(db_file, status)
+    if format == "display":
+        jobs = [_display_job(j) for j in jobs]
     return {"jobs": jobs}
 
 
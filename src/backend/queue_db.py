@@ -1,10 +1,19 @@
 import json
+import os
 import sqlite3
 import time
 from typing import Optional, Any
 
 
+# Paths whose schema/migrations have already run in this process.
+_INITIALIZED_DBS: set[str] = set()
+
+
 def init_db(db_path: str):
+    """Create the schema and run migrations; a no-op after the first call per path."""
+    # A deleted database file is recreated rather than trusted from the cache
+    if db_path in _INITIALIZED_DBS and os.path.exists(db_path):
+        return
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
     cur.execute(
@@ -58,6 +67,7 @@ def init_db(db_path: str):
     
     conn.commit()
     conn.close()
+    _INITIALIZED_DBS.add(db_path)
 
 
 def enqueue_job(db_path: str, payload: Any, payload_json_path: str = None) -> int:
@@ -1,84 +1,109 @@
 import sqlite3
 import os
-from typing import Optional, Dict
+import threading
+from typing import Optional, Dict, List
+
+# One long-lived connection per database path; the lock serializes access
+# because the connection is shared across FastAPI worker threads.
+_CONN_CACHE: Dict[str, sqlite3.Connection] = {}
+_CONN_LOCK = threading.RLock()
+_BULK_CHUNK = 900
 
 
 def _get_conn(db_path: str) -> sqlite3.Connection:
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
     conn.execute("PRAGMA journal_mode=WAL;")
+    # Review writes are tiny; NORMAL is durable enough under WAL and avoids an fsync per commit.
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-20000;")
+    conn.execute("PRAGMA busy_timeout=5000;")
     return conn
 
 
-def init_db(db_path: str) -> None:
-    conn = _get_conn(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS reviews (
-                name TEXT PRIMARY KEY,
-                status TEXT NOT NULL,
-                note TEXT
+def _conn(db_path: str) -> sqlite3.Connection:
+    """Return the cached connection for db_path, creating it and the schema on first use."""
+    with _CONN_LOCK:
+        conn = _CONN_CACHE.get(db_path)
+        if conn is None:
+            conn = _get_conn(db_path)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reviews (
+                    name TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    note TEXT
+                )
+                """
             )
-            """
-        )
-        conn.commit()
-    finally:
-        conn.close()
+            conn.commit()
+            _CONN_CACHE[db_path] = conn
+        return conn
+
+
+def _exists(db_path: str) -> bool:
+    return db_path in _CONN_CACHE or os.path.exists(db_path)
+
+
+def init_db(db_path: str) -> None:
+    _conn(db_path)
 
 
 def set_review(db_path: str, name: str, status: str, note: Optional[str]) -> None:
-    init_db(db_path)
-    conn = _get_conn(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
+    with _CONN_LOCK:
+        conn = _conn(db_path)
+        conn.execute(
             "INSERT INTO reviews(name, status, note) VALUES (?, ?, ?) "
             "ON CONFLICT(name) DO UPDATE SET status=excluded.status, note=excluded.note",
             (name, status, note),
         )
         conn.commit()
-    finally:
-        conn.close()
 
 
 def get_review(db_path: str, name: str) -> Optional[Dict[str, str]]:
-    if not os.path.exists(db_path):
+    if not _exists(db_path):
         return None
-    conn = _get_conn(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT status, note FROM reviews WHERE name = ?", (name,))
+    with _CONN_LOCK:
+        cur = _conn(db_path).execute("SELECT status, note FROM reviews WHERE name = ?", (name,))
         row = cur.fetchone()
-        if not row:
-            return None
-        return {"status": row[0], "note": row[1]}
-    finally:
-        conn.close()
+    if not row:
+        return None
+    return {"status": row[0], "note": row[1]}
+
+
+def get_reviews_bulk(db_path: str, names: List[str]) -> Dict[str, Dict[str, str]]:
+    if not names or not _exists(db_path):
+        return {}
+    names = list(names)
+    rows = []
+    with _CONN_LOCK:
+        conn = _conn(db_path)
+        # Stay under SQLite's default host-parameter limit (999) for large listings.
+        for i in range(0, len(names), _BULK_CHUNK):
+            chunk = names[i:i + _BULK_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(
+                f"SELECT name, status, note FROM reviews WHERE name IN ({placeholders})",
+                chunk,
+            ).fetchall())
+    return {r[0]: {"status": r[1], "note": r[2]} for r in rows}
 
 
 def delete_review(db_path: str, name: str) -> bool:
-    if not os.path.exists(db_path):
+    if not _exists(db_path):
         return False
-    conn = _get_conn(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute("DELETE FROM reviews WHERE name = ?", (name,))
+    with _CONN_LOCK:
+        conn = _conn(db_path)
+        cur = conn.execute("DELETE FROM reviews WHERE name = ?", (name,))
         conn.commit()
         return cur.rowcount > 0
-    finally:
-        conn.close()
 
 
 def list_reviews(db_path: str) -> Dict[str, Dict[str, str]]:
-    if not os.path.exists(db_path):
+    if not _exists(db_path):
         return {}
-    conn = _get_conn(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT name, status, note FROM reviews")
+    with _CONN_LOCK:
+        cur = _conn(db_path).execute("SELECT name, status, note FROM reviews")
         rows = cur.fetchall()
-        return {r[0]: {"status": r[1], "note": r[2]} for r in rows}
-    finally:
-        conn.close()
+    return {r[0]: {"status": r[1], "note": r[2]} for r in rows}
@@ -1,5 +1,6 @@
 import platform
 import os
+import re
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
@@ -25,6 +26,7 @@ from backend.reviews_db import (
     init_db,
     set_review,
     get_review,
+    get_reviews_bulk,
     delete_review,
     list_reviews,
 )
@@ -45,6 +47,11 @@ import threading
 import time
 import json
 
+import orjson
+
+# Generation id prefix of a result filename ("<uuid>-<n>.png"); sidecars are "<uuid>.json"
+_UUID_RE = re.compile(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})')
+
 # ---------------------------------------------------------------------------
 # MONKEY-PATCH: Conv2d adapter no-op shim
 #
@@ -271,17 +278,14 @@ async def list_results():
         # Attempt to load accompanying JSON metadata (uuid.json)
         meta = {}
         try:
-            base_name = os.path.splitext(entry)[0]
-            import re
-
-            uuid_match = re.match(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', base_name)
+            uuid_match = _UUID_RE.match(entry)
             if uuid_match:
                 uuid = uuid_match.group(1)
                 json_path = os.path.join(path, uuid + ".json")
                 if os.path.exists(json_path):
                     try:
-                        with open(json_path, "r", encoding="utf-8") as f:
-                            meta = json.load(f)
+                        with open(json_path, "rb") as f:
+                            meta = orjson.loads(f.read())
                     except Exception:
                         meta = {}
         except Exception:
@@ -387,29 +391,28 @@ async def list_results_paged(page: int = 0, size: int = 20):
     end = start + size
     page_entries = all_entries[start:end]
 
-    # load reviews for each page entry
+    # load reviews for all page entries in one query
     db_file = os.path.join(path, "reviews.db")
     init_db(db_file)
+    reviews = get_reviews_bulk(db_file, page_entries)
 
     results = []
     for entry_name in page_entries:
         full = os.path.join(path, entry_name)
         stat = os.stat(full)
-        file_review = get_review(db_file, entry_name)
+        file_review = reviews.get(entry_name)
         
         # Extract UUID from filename and look for corresponding JSON
-        import re
-        base_name = os.path.splitext(entry_name)[0]
         # Match UUID pattern in filename (with or without batch suffix)
-        uuid_match = re.match(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', base_name)
+        uuid_match = _UUID_RE.match(entry_name)
         meta = {}
         if uuid_match:
             uuid = uuid_match.group(1)
             json_path = os.path.join(path, uuid + ".json")
             if os.path.exists(json_path):
                 try:
-                    with open(json_path, "r", encoding="utf-8") as f:
-                        meta = json.load(f)
+                    with open(json_path, "rb") as f:
+                        meta = orjson.loads(f.read())
                 except Exception:
                     pass
 
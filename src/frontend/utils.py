@@ -1,4 +1,5 @@
 import platform
+from dataclasses import dataclass
 from os import path
 from typing import List
 
@@ -29,6 +30,27 @@ def is_reshape_required(
     return reshape_required
 
 
+@dataclass
+class ReshapeTracker:
+    """Shape the local OpenVINO pipeline was last compiled for."""
+
+    width: int = 0
+    height: int = 0
+    model_id: str = ""
+    num_images: int = 0
+
+    def is_required(self, width: int, height: int, model_id: str, num_images: int) -> bool:
+        return is_reshape_required(
+            self.width, width, self.height, height, self.model_id, model_id, self.num_images, num_images
+        )
+
+    def update(self, width: int, height: int, model_id: str, num_images: int) -> None:
+        self.width = width
+        self.height = height
+        self.model_id = model_id
+        self.num_images = num_images
+
+
 def enable_openvino_controls() -> bool:
     return (
         is_openvino_device()
@@ -7,13 +7,14 @@ from backend.lora import get_lora_models
 from constants import DEVICE
 from state import get_settings, get_context
 from concurrent.futures import ThreadPoolExecutor
-import json
+import orjson
 import urllib.request
 import urllib.parse
 import os
 
 API_BASE = os.environ.get("API_URL", "http://127.0.0.1:8000")  # default to API server
 from frontend.webui.errors import show_error
+from backend.base64_image import pil_image_to_base64_str
 
 app_settings = get_settings()
 
@@ -23,6 +24,19 @@ previous_model_id = ""
 previous_num_of_images = 0
 
 
+# Last encoded init image; re-selecting the same result hands back the same decoded image
+_init_b64_cache = (None, None)
+
+
+def _init_image_b64(image) -> str:
+    global _init_b64_cache
+    cached_image, b64 = _init_b64_cache
+    if cached_image is not image:
+        b64 = pil_image_to_base64_str(image)
+        _init_b64_cache = (image, b64)
+    return b64
+
+
 def generate_image_to_image(
     prompt,
     negative_prompt,
@@ -71,8 +85,7 @@ def generate_image_to_image(
         
         # Convert PIL Image to base64 if present (needed for JSON serialization)
         if cfg.init_image and hasattr(cfg.init_image, 'mode'):  # Check if it's a PIL Image
-            from backend.base64_image import pil_image_to_base64_str
-            cfg.init_image = pil_image_to_base64_str(cfg.init_image)
+            cfg.init_image = _init_image_b64(cfg.init_image)
         
         if not API_BASE:
             try:
@@ -91,11 +104,11 @@ def generate_image_to_image(
             except Exception:
                 payload = {}
         url = API_BASE.rstrip("/") + "/api/queue"
-        body = json.dumps(payload).encode("utf-8")
+        body = orjson.dumps(payload)
         req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
         try:
             with urllib.request.urlopen(req, timeout=5) as resp:
-                return json.load(resp)
+                return orjson.loads(resp.read())
         except urllib.error.HTTPError as e:
             try:
                 body = e.read().decode('utf-8')
@@ -221,9 +234,7 @@ def get_image_to_image_ui() -> None:
     def _wrap_generate(prompt, negative_prompt, init_image, strength, lora_enabled_val, lora_model_val, lora_weight_val):
         # Apply LoRA selection to settings for this generation
         if app_settings.settings.lcm_diffusion_setting.use_openvino and lora_enabled_val:
-            from frontend.webui.errors import show_error as _show_err
-
-            _show_err("LoRA is not supported in OpenVINO mode.")
+            show_error("LoRA is not supported in OpenVINO mode.")
             return None, "Error: LoRA not supported in OpenVINO"
 
         lora_models_map_local = get_lora_models(
@@ -1,68 +1,175 @@
 import os
-import json
 import time
-import urllib.request
-import urllib.parse
+import tempfile
+from collections import OrderedDict
 import gradio as gr
+import httpx
+import orjson
 from state import get_settings
+from utils import format_timestamp
 from frontend.webui.connection_manager import get_connection_state
 
 API_BASE = os.environ.get("API_URL", "http://127.0.0.1:8000")  # default to API server
 conn_state = get_connection_state()
 
 
-def _api_get(path: str, params: dict = None):
+# Shared keep-alive client; handlers are async so Gradio awaits them on its event loop
+_CLIENT = httpx.AsyncClient(
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=8),
+)
+
+
+async def _api_get(path: str, params: dict = None):
     if not API_BASE:
         return None
     url = API_BASE.rstrip("/") + path
-    if params:
-        url = url + "?" + urllib.parse.urlencode(params)
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
-            result = json.load(resp)
-            conn_state.mark_connected()
-            return result
+        resp = await _CLIENT.get(url, params=params)
+        resp.raise_for_status()
+        result = orjson.loads(resp.content)
+        conn_state.mark_connected()
+        return result
     except Exception:
         conn_state.mark_disconnected()
         return None
 
 
-def _api_post(path: str, data: dict):
+async def _api_post(path: str, data: dict):
     url = API_BASE.rstrip("/") + path
-    body = json.dumps(data).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            result = json.load(resp)
-            conn_state.mark_connected()
-            return result
-    except urllib.error.HTTPError as e:
+        resp = await _CLIENT.post(url, content=orjson.dumps(data), headers={"Content-Type": "application/json"})
+    except Exception:
+        # Connection error
+        conn_state.mark_disconnected()
+        return None
+    conn_state.mark_connected()
+    if resp.is_error:
         # HTTP error (4xx, 5xx) - connection is fine, just a bad request
-        conn_state.mark_connected()
         try:
-            error_body = json.load(e)
-            error_msg = error_body.get("detail", str(e))
+            error_msg = orjson.loads(resp.content).get("detail", resp.reason_phrase)
         except Exception:
-            error_msg = str(e)
+            error_msg = f"HTTP {resp.status_code} {resp.reason_phrase}"
         return {"error": error_msg}
+    try:
+        return orjson.loads(resp.content)
     except Exception:
-        # Connection error
-        conn_state.mark_disconnected()
         return None
 
 
 app_settings = get_settings()
 
+# Average duration of recent done jobs only changes when a job finishes,
+# so it is recomputed at most every _AVG_TTL seconds.
+_AVG_TTL = 30
+_avg_cache = {"value": None, "expires": 0.0}
+
+# Refreshes arriving within this window reuse the session's previous result
+_REFRESH_DEBOUNCE = 0.25
+
+# Mirror document visibility into a hidden checkbox so the timer can be
+# paused while the browser tab is in the background.
+_VISIBILITY_JS = """
+() => {
+    document.addEventListener("visibilitychange", () => {
+        const box = document.querySelector("#queue-tab-visible input");
+        if (!box) return;
+        const visible = document.visibilityState === "visible";
+        if (box.checked !== visible) box.click();
+    });
+}
+"""
+
+
+# Job timestamp fields; format_timestamp memoizes their display strings
+_TS_KEYS = ("created_at", "started_at", "finished_at")
+
 
 def _fmt(ts):
     if not ts:
         return ""
     try:
-        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(float(ts)))
+        return format_timestamp(float(ts))
     except Exception:
         return str(ts)
 
 
+def _normalize_timestamps(jobs):
+    """Coerce job timestamps to float once at ingestion so row formatting needs no try/except"""
+    for j in jobs:
+        for key in _TS_KEYS:
+            ts = j.get(key)
+            if ts and not isinstance(ts, float):
+                try:
+                    j[key] = float(ts)
+                except (TypeError, ValueError):
+                    j[key] = None
+    return jobs
+
+
+# Status column text; only retried running jobs need per-row formatting
+_STATUS_DISPLAY = {st: st for st in ("queued", "running", "done", "failed", "cancelled")}
+_F_RERUN = "rerunning({})".format
+
+
+def _row_timestamps(j):
+    # /api/queue?format=display returns pre-formatted strings; format locally for older servers
+    if "created_at_display" in j:
+        return [j[f"{key}_display"] for key in _TS_KEYS]
+    return [format_timestamp(j[key]) if j.get(key) else "" for key in _TS_KEYS]
+
+
+def _job_rows(jobs, show_completed_filter=True):
+    rows = []
+    for j in jobs or []:
+        job_status = j.get("status")
+        # Filter out completed/failed if checkbox is unchecked
+        if not show_completed_filter and job_status in ("done", "failed", "cancelled"):
+            continue
+        
+        # Show retry count as 'rerunning' only when the job is actively running
+        retry_count = j.get("retry_count", 0)
+        if retry_count and job_status == "running":
+            status_display = _F_RERUN(retry_count)
+        else:
+            status_display = _STATUS_DISPLAY.get(job_status, job_status)
+            
+        rows.append([
+            j.get("id"),
+            status_display,
+            *_row_timestamps(j),
+            (j.get("result") or "")[:200],
+        ])
+    return rows
+
+
+# Parsed payloads keyed by job id -> (payload length, parsed). Keying on the id avoids
+# hashing multi-MB payload strings (base64 init images) and keeping them alive.
+_PAYLOAD_CACHE_MAX = 64
+_payload_cache = OrderedDict()
+
+
+def _parse_payload(job_id, payload_str):
+    """Parse a job payload; payloads are immutable per job, so cache by id. Callers must not mutate."""
+    hit = _payload_cache.get(job_id)
+    if hit is not None and hit[0] == len(payload_str):
+        _payload_cache.move_to_end(job_id)
+        return hit[1]
+    parsed = orjson.loads(payload_str)
+    _payload_cache[job_id] = (len(payload_str), parsed)
+    if len(_payload_cache) > _PAYLOAD_CACHE_MAX:
+        _payload_cache.popitem(last=False)
+    return parsed
+
+
+def _queue_signature(jobs, show_completed_filter):
+    """Cheap change-detection key for the rendered table"""
+    return hash((
+        show_completed_filter,
+        tuple((j.get("id"), j.get("status"), j.get("retry_count"), j.get("finished_at")) for j in jobs),
+    ))
+
+
 def get_queue_ui():
     with gr.Blocks() as queue_block:
         # Current job status display
@@ -95,23 +202,28 @@ def get_queue_ui():
             interactive=False
         )
         
+        jobs_state = gr.State(value=[])
+        queue_sig = gr.State(value=None)
+        # This session's last refresh as (time, filter, result), for the debounce
+        last_refresh = gr.State(value=None)
         details_area = gr.Markdown("")
         download_file = gr.File(label="Downloaded Payload", visible=True)
         
-        # Hidden timer for auto-refresh every 3 seconds
-        timer = gr.Timer(value=3, active=True)
+        # Hidden timer for auto-refresh every 5 seconds
+        timer = gr.Timer(value=5, active=True)
+        tab_visible = gr.Checkbox(value=True, elem_id="queue-tab-visible", elem_classes=["hidden-signal"])
 
-        def _get_current_job_status():
-            """Fetch and format the current running job"""
-            payload = _api_get("/api/queue", params={"status": "running"})
+        def _get_current_job_status(payload=None):
+            """Format the current running job from an already-fetched queue payload"""
             if not payload or not payload.get("jobs"):
                 return "### Current Job: None"
             
             jobs = payload.get("jobs", [])
-            if not jobs:
+            running_jobs = [j for j in jobs if j.get("status") == "running"]
+            if not running_jobs:
                 return "### Current Job: None"
             
-            job = jobs[0]  # Get the first running job
+            job = running_jobs[0]  # Get the first running job
             job_id = job.get("id")
             started_at = job.get("started_at")
             
@@ -119,40 +231,40 @@ def get_queue_ui():
             elapsed = ""
             elapsed_seconds = 0
             if started_at:
-                try:
-                    elapsed_seconds = int(time.time() - float(started_at))
-                    minutes = elapsed_seconds // 60
-                    seconds = elapsed_seconds % 60
-                    elapsed = f"{minutes}m {seconds}s"
-                except Exception:
-                    elapsed = "unknown"
+                # started_at is already a float (see _normalize_timestamps)
+                elapsed_seconds = int(time.time() - started_at)
+                minutes, seconds = divmod(elapsed_seconds, 60)
+                elapsed = f"{minutes}m {seconds}s"
             
             # Calculate average completion time from last 5 done jobs
             estimated_total = ""
-            try:
-                done_payload = _api_get("/api/queue", params={"status": "done"})
-                if done_payload and done_payload.get("jobs"):
-                    done_jobs = done_payload.get("jobs", [])[:5]  # Last 5 done jobs
+            now = time.time()
+            if now >= _avg_cache["expires"]:
+                avg_duration = None
+                try:
+                    done_jobs = [j for j in jobs if j.get("status") == "done"][:5]  # Last 5 done jobs
                     durations = []
                     for dj in done_jobs:
                         start = dj.get("started_at")
                         finish = dj.get("finished_at")
                         if start and finish:
-                            duration = float(finish) - float(start)
+                            duration = finish - start
                             if duration > 0:
                                 durations.append(duration)
-                    
                     if durations:
                         avg_duration = int(sum(durations) / len(durations))
-                        est_minutes = avg_duration // 60
-                        est_seconds = avg_duration % 60
-                        estimated_total = f" / {est_minutes}m {est_seconds}s"
-            except Exception:
-                pass  # If we can't calculate, just don't show estimate
+                except Exception:
+                    pass  # If we can't calculate, just don't show estimate
+                _avg_cache["value"] = avg_duration
+                _avg_cache["expires"] = now + _AVG_TTL
+            avg_duration = _avg_cache["value"]
+            if avg_duration is not None:
+                est_minutes, est_seconds = divmod(avg_duration, 60)
+                estimated_total = f" / {est_minutes}m {est_seconds}s"
             
             # Get job details
             try:
-                job_payload = json.loads(job.get("payload", "{}"))
+                job_payload = _parse_payload(job_id, job.get("payload", "{}"))
                 job_type = job_payload.get("diffusion_task", "unknown").replace("_", " ").title()
                 prompt = job_payload.get("prompt", "")
                 # Truncate long prompts
@@ -168,9 +280,9 @@ def get_queue_ui():
             except Exception:
                 return f"### Current Job: #{job_id} (Running for {elapsed}{estimated_total})"
 
-        def _toggle_pause():
+        async def _toggle_pause():
             """Toggle queue pause state"""
-            resp = _api_post("/api/queue/pause", {})
+            resp = await _api_post("/api/queue/pause", {})
             if not resp:
                 return "⏸️ Pause Queue", "Failed to toggle pause - connection error"
             if "error" in resp:
@@ -182,85 +294,91 @@ def get_queue_ui():
             else:
                 return "⏸️ Pause Queue", "✓ Queue resumed - processing jobs"
 
-        def _refresh(show_completed_filter=True):
+        async def _refresh(show_completed_filter=True, last_sig=None, last=None):
+            now = time.time()
+            if (
+                last is not None
+                and last[1] == show_completed_filter
+                and now - last[0] < _REFRESH_DEBOUNCE
+            ):
+                result = last[2]
+                refresh_update = gr.skip()
+            else:
+                result = await _build_refresh(show_completed_filter)
+                refresh_update = (now, show_completed_filter, result)
+            rows, status_text, current_job, pause_btn_label, jobs = result
+            sig = _queue_signature(jobs, show_completed_filter)
+            if sig == last_sig:
+                # Table unchanged for this session: only refresh the live status widgets
+                return gr.skip(), status_text, current_job, pause_btn_label, gr.skip(), sig, refresh_update
+            return rows, status_text, current_job, pause_btn_label, jobs, sig, refresh_update
+
+        async def _build_refresh(show_completed_filter=True):
             # Check pause state
-            pause_state = _api_get("/api/queue/pause")
+            pause_state = await _api_get("/api/queue/pause")
             paused = pause_state.get("paused", False) if pause_state else False
             pause_btn_label = "▶️ Resume Queue" if paused else "⏸️ Pause Queue"
             
-            payload = _api_get("/api/queue")
+            payload = await _api_get("/api/queue", params={"format": "display"})
             
             if not payload:
-                return [], "(failed to fetch queue)", _get_current_job_status(), pause_btn_label
-            rows = []
-            for j in payload.get("jobs", []):
-                job_status = j.get("status")
-                # Filter out completed/failed if checkbox is unchecked
-                if not show_completed_filter and job_status in ("done", "failed", "cancelled"):
-                    continue
-                
-                # Show retry count as 'rerunning' only when the job is actively running
-                retry_count = j.get("retry_count", 0)
-                if job_status == "running" and retry_count > 0:
-                    status_display = f"rerunning({retry_count})"
-                else:
-                    status_display = job_status
-                    
-                rows.append([
-                    j.get("id"),
-                    status_display,
-                    _fmt(j.get("created_at")),
-                    _fmt(j.get("started_at")),
-                    _fmt(j.get("finished_at")),
-                    (j.get("result") or "")[:200],
-                ])
-            return rows, f"Loaded {len(rows)} jobs", _get_current_job_status(), pause_btn_label
-
-        def _cancel(job_id):
+                return [], "(failed to fetch queue)", _get_current_job_status(None), pause_btn_label, []
+            jobs = _normalize_timestamps(payload.get("jobs", []))
+            rows = _job_rows(jobs, show_completed_filter)
+            return rows, f"Loaded {len(rows)} jobs", _get_current_job_status(payload), pause_btn_label, jobs
+
+        def _filter(jobs, show_completed_filter=True):
+            """Re-apply the completed/failed filter to the last fetched jobs"""
+            rows = _job_rows(jobs, show_completed_filter)
+            return rows, f"Loaded {len(rows)} jobs", _queue_signature(jobs, show_completed_filter)
+
+        async def _cancel(job_id):
             if not job_id:
                 return "No job id provided"
-            resp = _api_post(f"/api/queue/{int(job_id)}/cancel", {})
+            resp = await _api_post(f"/api/queue/{int(job_id)}/cancel", {})
             if not resp:
                 return "Cancel failed - connection error"
             if "error" in resp:
                 return f"Cancel failed: {resp['error']}"
+            _avg_cache["expires"] = 0.0
             return f"✓ Cancelled job #{job_id}"
 
-        def _rerun(job_id):
+        async def _rerun(job_id):
             if not job_id:
                 return "No job id provided"
             try:
                 # Get the job payload
-                job_payload = _api_get(f"/api/queue/{int(job_id)}")
+                job_payload = await _api_get(f"/api/queue/{int(job_id)}")
                 if not job_payload or not job_payload.get("job"):
                     return f"Job {job_id} not found"
                 
                 # Extract the original payload
                 job = job_payload.get("job")
                 payload_str = job.get("payload", "{}")
-                payload = json.loads(payload_str)
+                payload = orjson.loads(payload_str)
                 
                 # Enqueue a new job with the same payload
-                resp = _api_post("/api/queue", payload)
+                resp = await _api_post("/api/queue", payload)
                 if resp and resp.get("job_id"):
+                    _avg_cache["expires"] = 0.0
                     return f"Requeued as job {resp.get('job_id')}"
                 return "Failed to requeue"
             except Exception as e:
                 return f"Failed to rerun: {e}"
 
-        def _easyregen(job_id):
+        async def _easyregen(job_id):
             if not job_id:
                 return "No job id provided"
             try:
                 # Get the job payload
-                job_payload = _api_get(f"/api/queue/{int(job_id)}")
+                job_payload = await _api_get(f"/api/queue/{int(job_id)}")
                 if not job_payload or not job_payload.get("job"):
                     return f"Job {job_id} not found"
                 
                 # Extract and modify the payload
                 job = job_payload.get("job")
                 payload_str = job.get("payload", "{}")
-                payload = json.loads(payload_str)
+                payload = orjson.loads(payload_str)
                 
                 # Modify for easy/fast regeneration
                 payload["image_width"] = 512
@@ -268,18 +386,19 @@ def get_queue_ui():
                 payload["inference_steps"] = 8
                 
                 # Enqueue the modified job
-                resp = _api_post("/api/queue", payload)
+                resp = await _api_post("/api/queue", payload)
                 if resp and resp.get("job_id"):
+                    _avg_cache["expires"] = 0.0
                     return f"EasyRegen queued as job {resp.get('job_id')} (512x512, 8 steps)"
                 return "Failed to queue easyregen"
             except Exception as e:
                 return f"Failed to easyregen: {e}"
 
 
-        def _details(job_id):
+        async def _details(job_id):
             if not job_id:
                 return "No job id provided", ""
-            payload = _api_get(f"/api/queue/{int(job_id)}")
+            payload = await _api_get(f"/api/queue/{int(job_id)}")
             if not payload or not payload.get("job"):
                 return f"Job {job_id} not found", ""
             j = payload.get("job")
@@ -293,18 +412,17 @@ def get_queue_ui():
             )
             return f"Loaded job {job_id}", text
 
-        def _download_payload(job_id):
+        async def _download_payload(job_id):
             if not job_id:
                 return "No job id provided", None
             try:
                 url = f"{API_BASE}/api/queue/{int(job_id)}/payload"
-                req = urllib.request.Request(url)
-                with urllib.request.urlopen(req, timeout=10) as resp:
-                    content = resp.read()
-                    # Save to temporary file
-                    import tempfile
+                async with _CLIENT.stream("GET", url, timeout=10) as resp:
+                    resp.raise_for_status()
+                    # Stream straight to a temporary file instead of buffering the body
                     with tempfile.NamedTemporaryFile(mode='wb', suffix=f'_job_{int(job_id)}_payload.json', delete=False) as tmp:
-                        tmp.write(content)
+                        async for chunk in resp.aiter_bytes(65536):
+                            tmp.write(chunk)
                         tmp_path = tmp.name
                 return f"Downloaded payload for job {job_id}", tmp_path
             except Exception as e:
@@ -353,12 +471,16 @@ def get_queue_ui():
         table.select(fn=_on_row_select, outputs=[job_id_input, status])
         
         # Auto-refresh on tab load
-        queue_block.load(fn=_refresh, inputs=[show_completed], outputs=[table, status, current_job_display, pause_btn])
+        queue_block.load(fn=_refresh, inputs=[show_completed, queue_sig, last_refresh], outputs=[table, status, current_job_display, pause_btn, jobs_state, queue_sig, last_refresh])
+        
+        # Auto-refresh every 5 seconds via timer (updates current job timer too)
+        timer.tick(fn=_refresh, inputs=[show_completed, queue_sig, last_refresh], outputs=[table, status, current_job_display, pause_btn, jobs_state, queue_sig, last_refresh])
         
-        # Auto-refresh every 3 seconds via timer (updates current job timer too)
-        timer.tick(fn=_refresh, inputs=[show_completed], outputs=[table, status, current_job_display, pause_btn])
+        # Pause the timer while the browser tab is hidden
+        queue_block.load(fn=None, js=_VISIBILITY_JS)
+        tab_visible.change(fn=lambda visible: gr.Timer(active=visible), inputs=[tab_visible], outputs=[timer])
         
-        # Refresh when filter checkbox changes
-        show_completed.change(fn=_refresh, inputs=[show_completed], outputs=[table, status, current_job_display, pause_btn])
+        # Re-filter the cached jobs when the checkbox changes (no refetch)
+        show_completed.change(fn=_filter, inputs=[jobs_state, show_completed], outputs=[table, status, queue_sig])
     
     return queue_block
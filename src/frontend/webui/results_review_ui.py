@@ -1,11 +1,21 @@
+import asyncio
+import atexit
 import os
+import re
+import threading
 import time
-import json
+from datetime import datetime
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 import gradio as gr
-from PIL import Image
+import httpx
+import orjson
+from PIL import Image, ImageFile
 from state import get_settings
-import urllib.request
-import urllib.parse
+from utils import IMAGE_MAGIC, atomic_save_image
+from urllib.parse import quote
 from frontend.webui.connection_manager import get_connection_state
 
 # Debug logging control
@@ -13,89 +23,562 @@ DEBUG_ENABLED = os.environ.get("DEBUG", "false").lower() in ("true", "1", "yes")
 
 API_BASE = os.environ.get("API_URL", "http://127.0.0.1:8000")  # default to API server
 conn_state = get_connection_state()
+app_settings = get_settings()
+
+# Shared keep-alive client so each refresh reuses one connection to the API server
+_CLIENT = httpx.Client(
+    timeout=5.0,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+)
+
 
 def _api_get(path: str, params: dict = None):
     if not API_BASE:
         return None
     url = API_BASE.rstrip("/") + path
-    if params:
-        url = url + "?" + urllib.parse.urlencode(params)
     try:
-        with urllib.request.urlopen(url, timeout=5) as resp:
-            result = json.load(resp)
-            conn_state.mark_connected()
-            return result
+        resp = _CLIENT.get(url, params=params)
+        resp.raise_for_status()
+        result = orjson.loads(resp.content)
+        conn_state.mark_connected()
+        return result
     except Exception:
         conn_state.mark_disconnected()
         return None
 
-def _api_post(path: str, data: dict):
+def _api_delete(path: str):
     url = API_BASE.rstrip("/") + path
-    body = json.dumps(data).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            result = json.load(resp)
-            conn_state.mark_connected()
-            return result
+        resp = _CLIENT.delete(url)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
     except Exception:
-        conn_state.mark_disconnected()
         return None
 
-def _api_delete(path: str):
+
+# Async client for the click handlers, so a slow API doesn't hold a Gradio worker thread
+_ACLIENT = httpx.AsyncClient(
+    timeout=5.0,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+)
+
+
+def _close_clients():
+    # Release pooled sockets at interpreter exit; the async client's loop may already be gone
+    _CLIENT.close()
+    try:
+        asyncio.run(_ACLIENT.aclose())
+    except Exception:
+        pass
+
+
+atexit.register(_close_clients)
+
+
+async def _api_post_async(path: str, data: dict):
     url = API_BASE.rstrip("/") + path
-    req = urllib.request.Request(url, method="DELETE")
     try:
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            return json.load(resp)
+        resp = await _ACLIENT.post(url, content=orjson.dumps(data), headers={"Content-Type": "application/json"})
+        resp.raise_for_status()
+        result = orjson.loads(resp.content)
+        conn_state.mark_connected()
+        return result
     except Exception:
+        conn_state.mark_disconnected()
         return None
 
 
-app_settings = get_settings()
+# Shared pool for per-slot results file I/O in _populate_page
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="results-io")
+
+# Short-lived cache of /api/results/paged payloads keyed by (page, size). Stale entries are
+# served while a background refresh runs, and kept as last-known-good if the API is down.
+_PAGED_TTL = 5.0
+_PAGED_MAX = 16
+_paged_cache = {}
+# Single-flight: concurrent fetches of the same page share one in-flight request
+_paged_inflight = {}
+_paged_lock = threading.Lock()
+# Bumped on invalidation; fetches started under an older generation don't write back
+_paged_gen = 0
+
+
+def _invalidate_paged_cache():
+    global _paged_gen
+    with _paged_lock:
+        _paged_gen += 1
+        _paged_cache.clear()
+        # Later callers start a fresh fetch instead of joining one that predates the change
+        _paged_inflight.clear()
+
+
+def _fetch_paged(key, gen):
+    # Revalidate with the cached ETag; a 304 keeps the cached payload without a re-parse
+    if not API_BASE:
+        return None
+    hit = _paged_cache.get(key)
+    etag = hit[2] if hit else None
+    try:
+        resp = _CLIENT.get(
+            API_BASE.rstrip("/") + "/api/results/paged",
+            params={"page": key[0], "size": key[1]},
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        if resp.status_code == 304 and hit:
+            payload = hit[1]
+        else:
+            resp.raise_for_status()
+            payload = orjson.loads(resp.content)
+            etag = resp.headers.get("ETag")
+        conn_state.mark_connected()
+    except Exception:
+        conn_state.mark_disconnected()
+        return None
+    if payload:
+        with _paged_lock:
+            if gen != _paged_gen:
+                return payload  # invalidated mid-flight; don't cache the stale page
+            _paged_cache[key] = (time.monotonic(), payload, etag)
+            if len(_paged_cache) > _PAGED_MAX:
+                # Drop the least recently fetched page so paging through a large history stays bounded
+                oldest = min(_paged_cache, key=lambda k: _paged_cache[k][0])
+                _paged_cache.pop(oldest, None)
+    return payload
+
+
+def _paged_future(key):
+    with _paged_lock:
+        fut = _paged_inflight.get(key)
+        created = fut is None
+        if created:
+            fut = _IO_POOL.submit(_fetch_paged, key, _paged_gen)
+            _paged_inflight[key] = fut
+    if created:
+        def _done(f):
+            with _paged_lock:
+                if _paged_inflight.get(key) is f:
+                    del _paged_inflight[key]
+
+        fut.add_done_callback(_done)
+    return fut
+
+
+def _cached_paged(page: int, size: int):
+    key = (page, size)
+    hit = _paged_cache.get(key)
+    if hit is None:
+        try:
+            return _paged_future(key).result(timeout=6)
+        except Exception:
+            return None
+    ts, payload, _ = hit
+    if time.monotonic() - ts >= _PAGED_TTL:
+        _paged_future(key)
+    return payload
+
+
+def _listing_etag(page: int, size: int):
+    """Revalidate a page against the API and return its ETag, or None if unknown."""
+    key = (page, size)
+    try:
+        _paged_future(key).result(timeout=6)
+    except Exception:
+        return None
+    hit = _paged_cache.get(key)
+    return hit[2] if hit else None
+
+
+def _warm_page(payload, results_path: str):
+    for item in (payload or {}).get("results", []):
+        if item.get("header_ok"):
+            src = os.path.join(results_path, item["name"])
+            _IO_POOL.submit(_thumbnail_for, src)
+            _IO_POOL.submit(_preview_for, src)
+
+
+def _prefetch_page(page: int, size: int, results_path: str):
+    """Fetch a page payload and build its thumbnails/previews in the background.
+
+    Never blocks: an uncached payload is warmed from its fetch's done-callback.
+    """
+    hit = _paged_cache.get((page, size))
+    if hit is not None:
+        _warm_page(hit[1], results_path)
+        return
+
+    def _done(fut):
+        if fut.exception() is None:
+            _warm_page(fut.result(), results_path)
+
+    _paged_future((page, size)).add_done_callback(_done)
+
+
+# One scanned result file; built from a single DirEntry.stat() so callers never re-stat
+ResultEntry = namedtuple("ResultEntry", ["path", "name", "mtime", "size"])
+
+# Directory listing cache, invalidated when the results directory mtime changes
+_dir_cache = {"path": None, "dir_mtime": None, "entries": []}
+
+
+def _invalidate_dir_cache():
+    _dir_cache["dir_mtime"] = None
+
+
+# Batch index suffix of a result image stem ("<uuid>-1")
+_SUFFIX_RE = re.compile(r"-\d+$")
+
+def _valid_header(pth: str) -> bool:
+    # Raw fd read: no buffered file object for an 8-byte sniff
+    try:
+        fd = os.open(pth, os.O_RDONLY)
+        try:
+            head = os.read(fd, 8)
+        finally:
+            os.close(fd)
+    except OSError:
+        return False
+    return head.startswith(IMAGE_MAGIC)
+
+
+def _is_valid_image(pth: str, size: int) -> bool:
+    # size comes from the scandir stat, so no re-stat here
+    if size <= 16:
+        if DEBUG_ENABLED:
+            print(f"[DEBUG-UI] skipping small file: {pth} ({size} bytes)")
+        return False
+    if _valid_header(pth):
+        return True
+    if DEBUG_ENABLED:
+        print(f"[DEBUG-UI] skipping invalid-header file: {pth}")
+    return False
+
+
+@lru_cache(maxsize=4)
+def _resolve_results_dir(configured: str) -> str:
+    if configured:
+        return configured
+    from paths import FastStableDiffusionPaths
+
+    return FastStableDiffusionPaths.get_results_path()
+
+
+def _results_dir() -> str:
+    # Keyed on the configured path, so a settings change is still picked up
+    return _resolve_results_dir(app_settings.settings.generated_images.path)
 
 
 def _list_results_paths():
     # not used when API-backed; kept for fallback
-    path = app_settings.settings.generated_images.path
-    if not path:
-        from paths import FastStableDiffusionPaths
-
-        path = FastStableDiffusionPaths.get_results_path()
+    path = _results_dir()
 
     if not os.path.exists(path):
         return []
 
-    def _is_valid_image(pth: str) -> bool:
+    try:
+        dir_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    if _dir_cache["path"] == path and _dir_cache["dir_mtime"] == dir_mtime:
+        return _dir_cache["entries"]
+
+    # Single scandir pass: DirEntry caches is_file()/stat() so each file is stat'd once.
+    # Returns ResultEntry tuples, newest first, so callers never need to re-stat.
+    # Headers are not read here; callers validate only the page they display.
+    entries = []
+    with os.scandir(path) as it:
+        for e in it:
+            if not e.name.lower().endswith((".jpg", ".png", ".jpeg")):
+                continue
+            try:
+                if not e.is_file(follow_symlinks=False):
+                    continue
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append(ResultEntry(e.path, e.name, st.st_mtime, st.st_size))
+    entries.sort(key=lambda t: t.mtime, reverse=True)
+    _dir_cache.update(path=path, dir_mtime=dir_mtime, entries=entries)
+    return entries
+
+
+# Gallery thumbnails and slot previews are cached as JPEGs under <results>/.thumbs/
+_THUMB_DIR = ".thumbs"
+_THUMB_SIZE = (256, 256)
+_PREVIEW_SIZE = (600, 600)
+
+
+def _thumbnail_for(path: str, size=_THUMB_SIZE, suffix: str = ".jpg") -> str:
+    """Return a cached thumbnail for path, regenerating it when the source is newer.
+
+    Falls back to the original path if the thumbnail cannot be written.
+    """
+    thumb_dir = os.path.join(os.path.dirname(path), _THUMB_DIR)
+    thumb = os.path.join(thumb_dir, os.path.basename(path) + suffix)
+    try:
+        src_mtime = os.stat(path).st_mtime
         try:
-            st = os.stat(pth)
-            if st.st_size <= 16:
-                if DEBUG_ENABLED:
-                    print(f"[DEBUG-UI] skipping small file: {pth} ({st.st_size} bytes)")
-                return False
-            with open(pth, "rb") as fh:
-                prefix = fh.read(8)
-            if prefix.startswith(b"\x89PNG\r\n\x1a\n") or prefix.startswith(b"\xff\xd8"):
-                return True
-            if DEBUG_ENABLED:
-                print(f"[DEBUG-UI] skipping invalid-header file: {pth}")
-            return False
-        except Exception:
-            return False
+            if os.stat(thumb).st_mtime >= src_mtime:
+                return thumb
+        except FileNotFoundError:
+            pass
+        with Image.open(path) as im:
+            im.thumbnail(size)
+            if not atomic_save_image(im.convert("RGB"), thumb, jpeg_quality=85):
+                return path
+        return thumb
+    except Exception:
+        if DEBUG_ENABLED:
+            print(f"[DEBUG-UI] failed to build thumbnail for: {path}")
+        return path
+
+
+def _preview_for(path: str) -> str:
+    # Display-sized copy for the per-slot image; handlers still use the original
+    return _thumbnail_for(path, _PREVIEW_SIZE, ".preview.jpg")
+
+
+def _fmt_mtime(ts: float) -> str:
+    # Same "YYYY-MM-DD HH:MM:SS" local time as time.strftime, via datetime's C formatter
+    return datetime.fromtimestamp(ts).isoformat(sep=" ", timespec="seconds")
+
+
+# Output values for an unused page slot: image, name, modified, prompt, model, path, json name
+_EMPTY_ROW = ("", "", "", "", "", "", "")
+
+
+# Names repeat across renders and clicks; percent-encode each one once
+_quoted = lru_cache(maxsize=1024)(quote)
+
+
+def _file_url(path: str) -> str:
+    # Relative so it keeps working when the UI is mounted under a sub-path
+    return path if path.startswith(("http://", "https://")) else "gradio_api/file=" + _quoted(path)
+
+
+def _slot_html(src: str, href: str) -> str:
+    """Slot image markup: the browser fetches the preview directly and lazily, links the original."""
+    return (
+        f'<a href="{_file_url(href)}" download target="_blank">'
+        f'<img src="{_file_url(src)}" loading="lazy" decoding="async" '
+        f'style="max-height:300px;max-width:100%;object-fit:contain"></a>'
+    )
+
+
+def _build_row(item: dict, results_path: str, placeholder_path: str, show_failed_filter: bool):
+    """Build the slot output values for one /api/results/paged item.
+
+    Returns (gallery_path, row); gallery_path is None when the file is missing or invalid.
+    """
+    name = item.get("name")
+    local_path = os.path.join(results_path, name)
+    # The API has already checked size and PNG/JPEG header for this entry
+    file_exists = bool(item.get("header_ok"))
+    image_url = local_path if file_exists else None
+    if DEBUG_ENABLED:
+        print(f"[DEBUG-UI] Image: name={name}, path={local_path}, exists={file_exists}")
+
+    # Filter out missing files if show_failed is False
+    if not show_failed_filter and not file_exists:
+        return None, _EMPTY_ROW
+
+    mtime = _fmt_mtime(item.get("mtime", 0))
+    meta = item.get("meta", {})
+    prompt_val = meta.get("prompt", "")
+    model_val = meta.get("model", "") or meta.get("openvino_model", "")
+    if DEBUG_ENABLED:
+        print(f"[DEBUG-UI]   prompt={prompt_val[:50] if prompt_val else 'EMPTY'}, model={model_val}")
+    if not file_exists:
+        # Show a placeholder on the card so missing files aren't blank
+        return None, (_slot_html(placeholder_path, placeholder_path), f"{name} (missing)", mtime, prompt_val, model_val, "", "")
+    if not os.path.exists(local_path):
+        # UI without access to the results directory: let the API build and serve the JPEGs
+        thumb_url = API_BASE.rstrip("/") + f"/api/results/{_quoted(name)}/thumb"
+        return f"{thumb_url}?w={_THUMB_SIZE[0]}", (
+            _slot_html(f"{thumb_url}?w={_PREVIEW_SIZE[0]}", API_BASE.rstrip("/") + f"/results/{_quoted(name)}"),
+            name, mtime, prompt_val, model_val, local_path, _derive_json_name(name),
+        )
+    return _thumbnail_for(image_url), (
+        _slot_html(_preview_for(image_url), image_url), name, mtime, prompt_val, model_val, local_path, _derive_json_name(name)
+    )
+
+
+def _open_init_image(path):
+    """Open an image for use as init image without decoding it up front.
+
+    PIL only reads the header here; RGB images are decoded lazily when the
+    generation path first touches the pixels. Other modes still need a
+    conversion now since the init image is later encoded as JPEG.
+    """
+    im = Image.open(path)
+    # JPEG only: have libjpeg decode straight to RGB so the convert below is skipped
+    im.draft("RGB", im.size)
+    return im if im.mode == "RGB" else im.convert("RGB")
+
+
+# Per-slot button handlers; each slot wires these with its own path/name component
+@lru_cache(maxsize=4)
+def _load_init_image(path: str, mtime_ns: int):
+    """Decoded init image, memoized so Img2Img then Variations on one result decodes once."""
+    im = _open_init_image(path)
+    im.load()  # decode now; also releases the file handle
+    return im
+
+
+def _fetch_init_image(url: str):
+    """Download and decode an image incrementally, so decoding overlaps the transfer."""
+    parser = ImageFile.Parser()
+    with _CLIENT.stream("GET", url) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_bytes(64 * 1024):
+            parser.feed(chunk)
+    im = parser.close()
+    return im if im.mode == "RGB" else im.convert("RGB")
+
+
+def _set_init_image(path, as_variations: bool):
+    name = os.path.basename(path)
+    try:
+        if os.path.isfile(path):
+            pil = _load_init_image(path, os.stat(path).st_mtime_ns)
+        else:
+            # Remote deployments: the UI host doesn't have the results directory
+            pil = _fetch_init_image(API_BASE.rstrip("/") + f"/results/{_quoted(name)}")
+    except Exception:
+        return "(failed to load image)" if not as_variations else "(failed)"
+    app_settings.settings.lcm_diffusion_setting.init_image = pil
+    if as_variations:
+        app_settings.settings.lcm_diffusion_setting.diffusion_task = "image_variations"
+        return f"Set {name} for variations"
+    return f"Set {name} as init image"
+
+
+def _use_img2img(path):
+    return _set_init_image(path, as_variations=False)
+
+
+def _use_variations(path):
+    return _set_init_image(path, as_variations=True)
+
+
+def _derive_json_name(name: str) -> str:
+    # Images are "<uuid>-<n>.png"; the generation's shared sidecar is "<uuid>.json"
+    return _SUFFIX_RE.sub("", os.path.splitext(name)[0]) + ".json"
+
+
+def _sidecar_url(json_name: str) -> str:
+    return API_BASE.rstrip("/") + f"/results/{_quoted(json_name)}"
+
+
+async def _fetch_sidecar(json_name: str) -> bytes:
+    # Streamed on the shared client: an error status raises before any body is read
+    async with _ACLIENT.stream("GET", _sidecar_url(json_name), timeout=2) as resp:
+        resp.raise_for_status()
+        return await resp.aread()
+
+
+async def _show_json(json_name):
+    if not json_name:
+        return "(no file)"
+    try:
+        # Sidecars are written indented by ImageSaver; show them as-is without a parse round-trip
+        text = (await _fetch_sidecar(json_name)).decode("utf-8")
+        return f"Loaded {json_name}:\n```json\n{text}\n```"
+    except Exception as e:
+        return f"failed to load json from {_sidecar_url(json_name)}: {e}"
+
+
+async def _regenerate(json_name):
+    if not json_name:
+        return "(no file)"
+    try:
+        payload = orjson.loads(await _fetch_sidecar(json_name))
+    except Exception:
+        payload = None
+
+    if not payload:
+        # try to construct minimal payload
+        payload = {"prompt": "", "diffusion_task": "text_to_image"}
+    # enqueue
+    resp = await _api_post_async("/api/queue", payload)
+    _invalidate_paged_cache()
+    if resp and resp.get("job_id"):
+        return f"Enqueued regenerate job {resp.get('job_id')}"
+    return "failed to enqueue regenerate"
+
 
-    entries = [
-        e for e in os.listdir(path)
-        if os.path.isfile(os.path.join(path, e))
-        and (e.lower().endswith('.jpg') or e.lower().endswith('.png') or e.lower().endswith('.jpeg'))
-        and _is_valid_image(os.path.join(path, e))
-    ]
-    entries.sort(key=lambda e: os.stat(os.path.join(path, e)).st_mtime, reverse=True)
-    return [os.path.join(path, e) for e in entries]
+async def _archive(path):
+    # Only this slot's components are updated; the rest of the page is left as-is
+    if not path:
+        return "(no file)", gr.update(), gr.update(), gr.update(), gr.update()
+    name = os.path.basename(path)
+    api_path = f"/api/results/{_quoted(name)}/archive"
+    resp = await _api_post_async(api_path, {})
+    if resp and resp.get("archived"):
+        _invalidate_dir_cache()
+        _invalidate_paged_cache()
+        return f"Archived {name}", "", f"{name} (archived)", "", ""
+    return f"Failed to archive {name}", gr.update(), gr.update(), gr.update(), gr.update()
+
+
+# Results timer interval bounds (seconds); the interval doubles on each idle tick
+_POLL_MIN = 10
+_POLL_MAX = 60
+
+
+def _reset_poll():
+    return gr.Timer(value=_POLL_MIN), _POLL_MIN
+
+
+# Client-side driver for the results tab, talking to Gradio through hidden checkboxes:
+# - #results-tab-visible follows whether the gallery is on screen (browser tab visibility
+#   plus an IntersectionObserver, which also catches switching to another app tab);
+# - #results-live is checked while the /api/results/events stream is connected;
+# - #results-changed is toggled on each change event, and whenever the tab becomes visible.
+_RESULTS_JS = """
+() => {
+    // The whole tab, so scrolling down to the result rows still counts as on screen
+    const tab = document.querySelector("#results-tab");
+    let onScreen = true;
+    const isVisible = () => onScreen && document.visibilityState === "visible";
+    const setBox = (id, value) => {
+        const box = document.querySelector(`#${id} input`);
+        if (box && box.checked !== value) box.click();
+    };
+    const pulse = () => {
+        const box = document.querySelector("#results-changed input");
+        if (box) box.click();
+    };
+    const sync = () => {
+        const visible = isVisible();
+        setBox("results-tab-visible", visible);
+        if (visible) pulse();
+    };
+    document.addEventListener("visibilitychange", sync);
+    if (tab && window.IntersectionObserver) {
+        new IntersectionObserver((entries) => {
+            onScreen = entries[entries.length - 1].isIntersecting;
+            sync();
+        }).observe(tab);
+    }
+    if (window.EventSource) {
+        const events = new EventSource(__EVENTS_URL__);
+        events.onopen = () => setBox("results-live", true);
+        events.onerror = () => setBox("results-live", false);
+        // Hidden tabs catch up through the pulse in sync() when shown again
+        events.onmessage = () => { if (isVisible()) pulse(); };
+    }
+}
+""".replace("__EVENTS_URL__", orjson.dumps(API_BASE.rstrip("/") + "/api/results/events").decode())
 
 
 def get_results_review_ui():
     PAGE_SIZE = 6
 
+    # Serve result images and their .thumbs straight from disk instead of copying
+    # them into Gradio's cache on every refresh.
+    results_path = _results_dir()
+    gr.set_static_paths([results_path])
+
     with gr.Blocks(css="""
         /* Desktop: show taller gallery (2.25x) and keep full width */
         @media (min-width: 768px) {
@@ -107,317 +590,235 @@ def get_results_review_ui():
         }
         .download-image-btn { cursor: pointer; }
     """) as results_block:
-        # Top navigation with filter
-        with gr.Row():
-            prev_btn_top = gr.Button("←", scale=0, min_width=50)
-            page_indicator = gr.Markdown("Page 1")
-            next_btn_top = gr.Button("→", scale=0, min_width=50)
-            reload_btn = gr.Button("🔄 Reload Images", size="sm")
-            show_failed = gr.Checkbox(label="Show Failed Images", value=True)
+        # Whole-tab wrapper; _RESULTS_JS watches it to know whether the tab is on screen
+        with gr.Column(elem_id="results-tab"):
+            # Top navigation with filter
+            with gr.Row():
+                prev_btn_top = gr.Button("←", scale=0, min_width=50)
+                page_indicator = gr.Markdown("Page 1")
+                next_btn_top = gr.Button("→", scale=0, min_width=50)
+                reload_btn = gr.Button("🔄 Reload Images", size="sm")
+                show_failed = gr.Checkbox(label="Show Failed Images", value=True)
             
-        # Preview gallery at top (hidden on desktop)
-        files_gallery = gr.Gallery(label="Generated results", columns=3, height=1040, elem_id="results-gallery-desktop-hide")
+            # Preview gallery at top (hidden on desktop)
+            files_gallery = gr.Gallery(label="Generated results", columns=3, height=1040, elem_id="results-gallery-desktop-hide", format="jpeg")
         
-        status_area = gr.Markdown("")
-        page_state = gr.State(value=0)
+            status_area = gr.Markdown("")
+            page_state = gr.State(value=0)
+            # Result count from the last page load; _next clamps against it instead of rescanning
+            total_state = gr.State(value=0)
         
-        # Hidden timer for auto-refresh every 10 seconds
-        timer = gr.Timer(value=10, active=True)
-
-        # create fixed slots for page items (image, filename, modified, prompt, model, actions)
-        image_slots = []
-        name_slots = []
-        mtime_slots = []
-        prompt_slots = []
-        model_slots = []
-        path_states = []
-
-        for i in range(PAGE_SIZE):
-            with gr.Row(variant="panel"):
-                with gr.Column(scale=2):
-                    # Image as download button
-                    img = gr.Image(value=None, type="filepath", interactive=False, height=300, show_download_button=True, show_label=False)
+            # Hidden auto-refresh timer; backs off while the results directory is unchanged
+            timer = gr.Timer(value=_POLL_MIN, active=True)
+            # This session's current timer interval in seconds
+            interval_state = gr.State(value=_POLL_MIN)
+            # Driven by _RESULTS_JS. The timer only runs while the tab is on screen and the
+            # change stream is down; otherwise refreshes come from results_changed.
+            tab_visible = gr.Checkbox(value=True, elem_id="results-tab-visible", elem_classes=["hidden-signal"])
+            sse_live = gr.Checkbox(value=False, elem_id="results-live", elem_classes=["hidden-signal"])
+            results_changed = gr.Checkbox(value=False, elem_id="results-changed", elem_classes=["hidden-signal"])
+            # Listing ETag seen by this session's last timer/load refresh
+            listing_version_state = gr.State(value=None)
+            # Page output values last sent to this session; unchanged ones are skipped
+            last_values_state = gr.State(value=None)
+
+            # create fixed slots for page items (image, filename, modified, prompt, model, actions)
+            image_slots = []
+            name_slots = []
+            mtime_slots = []
+            prompt_slots = []
+            model_slots = []
+            path_states = []
+            json_name_states = []
+
+            for i in range(PAGE_SIZE):
+                with gr.Row(variant="panel"):
+                    with gr.Column(scale=2):
+                        # Plain <img> so the browser loads the preview itself; the link downloads the original
+                        img = gr.HTML(value="")
                 
-                with gr.Column(scale=3):
-                    name_tb = gr.Textbox(value="", label="File", interactive=False)
-                    mtime_tb = gr.Textbox(value="", label="Modified", interactive=False)
-                    prompt_tb = gr.Textbox(value="", label="Prompt", interactive=False, lines=3)
-                    model_tb = gr.Textbox(value="", label="Model", interactive=False)
+                    with gr.Column(scale=3):
+                        name_tb = gr.Textbox(value="", label="File", interactive=False)
+                        mtime_tb = gr.Textbox(value="", label="Modified", interactive=False)
+                        prompt_tb = gr.Textbox(value="", label="Prompt", interactive=False, lines=3)
+                        model_tb = gr.Textbox(value="", label="Model", interactive=False)
                     
-                    # Compact action buttons row
-                    with gr.Row():
-                        use_img2img_btn = gr.Button("📷 Img2Img", size="sm", scale=1)
-                        use_var_btn = gr.Button("🔄 Variations", size="sm", scale=1)
-                        regen_btn = gr.Button("♻️ Regen", size="sm", scale=1)
-                        show_json_btn = gr.Button("{ } JSON", size="sm", scale=1)
-                        archive_btn = gr.Button("📦 Archive", size="sm", scale=1)
+                        # Compact action buttons row
+                        with gr.Row():
+                            use_img2img_btn = gr.Button("📷 Img2Img", size="sm", scale=1)
+                            use_var_btn = gr.Button("🔄 Variations", size="sm", scale=1)
+                            regen_btn = gr.Button("♻️ Regen", size="sm", scale=1)
+                            show_json_btn = gr.Button("{ } JSON", size="sm", scale=1)
+                            archive_btn = gr.Button("📦 Archive", size="sm", scale=1)
                     
-                    path_state = gr.State(value="")
-
-                image_slots.append(img)
-                name_slots.append(name_tb)
-                mtime_slots.append(mtime_tb)
-                prompt_slots.append(prompt_tb)
-                model_slots.append(model_tb)
-                path_states.append(path_state)
-
-                def _use_img2img(path):
-                    try:
-                        name = os.path.basename(path)
-                        url = API_BASE.rstrip("/") + f"/results/{urllib.parse.quote(name)}"
-                        pil = Image.open(url).convert("RGB")
-                        app_settings.settings.lcm_diffusion_setting.init_image = pil
-                        return f"Set {name} as init image"
-                    except Exception:
-                        try:
-                            pil = Image.open(path).convert("RGB")
-                            app_settings.settings.lcm_diffusion_setting.init_image = pil
-                            return f"Set {os.path.basename(path)} as init image"
-                        except Exception:
-                            return "(failed to load image)"
-
-                def _use_variations(path):
-                    try:
-                        name = os.path.basename(path)
-                        url = API_BASE.rstrip("/") + f"/results/{urllib.parse.quote(name)}"
-                        pil = Image.open(url).convert("RGB")
-                        app_settings.settings.lcm_diffusion_setting.init_image = pil
-                        app_settings.settings.lcm_diffusion_setting.diffusion_task = "image_variations"
-                        return f"Set {name} for variations"
-                    except Exception:
-                        try:
-                            pil = Image.open(path).convert("RGB")
-                            app_settings.settings.lcm_diffusion_setting.init_image = pil
-                            app_settings.settings.lcm_diffusion_setting.diffusion_task = "image_variations"
-                            return f"Set {os.path.basename(path)} for variations"
-                        except Exception:
-                            return "(failed)"
-
-                def _show_json(path):
-                    if not path:
-                        return "(no file)"
-                    name = os.path.basename(path)
-                    name_without_ext = os.path.splitext(name)[0]
-                    
-                    # Remove the -N suffix if present (e.g., "uuid-1" -> "uuid")
-                    # Images: uuid-1.png, uuid-2.png, etc.
-                    # JSON: uuid.json (no index suffix)
-                    if '-' in name_without_ext:
-                        parts = name_without_ext.rsplit('-', 1)
-                        # Only strip if last part is a number (the index)
-                        if len(parts) == 2 and parts[1].isdigit():
-                            name_without_ext = parts[0]
-                    
-                    json_url = API_BASE.rstrip("/") + f"/results/{urllib.parse.quote(name_without_ext + '.json')}"
-                    try:
-                        with urllib.request.urlopen(json_url, timeout=2) as f:
-                            data = json.load(f)
-                            pretty = json.dumps(data, indent=2)
-                            return f"Loaded JSON for {name}:\n```json\n{pretty}\n```"
-                    except Exception as e:
-                        return f"failed to load json from {json_url}: {e}"
-
-                def _regenerate(path):
-                    if not path:
-                        return "(no file)"
-                    name = os.path.basename(path)
-                    name_without_ext = os.path.splitext(name)[0]
-                    
-                    # Remove the -N suffix if present
-                    if '-' in name_without_ext:
-                        parts = name_without_ext.rsplit('-', 1)
-                        if len(parts) == 2 and parts[1].isdigit():
-                            name_without_ext = parts[0]
-                    
-                    json_url = API_BASE.rstrip("/") + f"/results/{urllib.parse.quote(name_without_ext + '.json')}"
-                    payload = None
+                        path_state = gr.State(value="")
+                        # Sidecar name ("<uuid>.json") resolved when the page is populated
+                        json_name_state = gr.State(value="")
+
+                    image_slots.append(img)
+                    name_slots.append(name_tb)
+                    mtime_slots.append(mtime_tb)
+                    prompt_slots.append(prompt_tb)
+                    model_slots.append(model_tb)
+                    path_states.append(path_state)
+                    json_name_states.append(json_name_state)
+
+                    use_img2img_btn.click(fn=_use_img2img, inputs=[path_state], outputs=[status_area])
+                    use_var_btn.click(fn=_use_variations, inputs=[path_state], outputs=[status_area])
+                    # Pass the filename textbox to _show_json (robust when path state is empty)
+                    show_json_btn.click(fn=_show_json, inputs=[json_name_state], outputs=[status_area])
+                    # A new result is on its way; poll at the base rate again
+                    regen_btn.click(fn=_regenerate, inputs=[json_name_state], outputs=[status_area]).then(
+                        fn=_reset_poll, outputs=[timer, interval_state]
+                    )
+                    archive_btn.click(fn=_archive, inputs=[path_state], outputs=[status_area, img, name_tb, path_state, json_name_state])
+
+            # Bottom navigation (same as top)
+            with gr.Row():
+                prev_btn_bottom = gr.Button("←", scale=0, min_width=50)
+                page_indicator_bottom = gr.Markdown("Page 1")
+                next_btn_bottom = gr.Button("→", scale=0, min_width=50)
+
+            def _populate_page(page_index: int, show_failed_filter: bool):
+                try:
                     try:
-                        with urllib.request.urlopen(json_url, timeout=2) as f:
-                            payload = json.load(f)
+                        payload = _cached_paged(page_index, PAGE_SIZE)
                     except Exception:
                         payload = None
+                        if DEBUG_ENABLED:
+                            import traceback
+                            print("[DEBUG-UI] exception calling _api_get:")
+                            traceback.print_exc()
 
                     if not payload:
-                        # try to construct minimal payload
-                        payload = {"prompt": "", "diffusion_task": "text_to_image"}
-                    # enqueue
-                    resp = _api_post("/api/queue", payload)
-                    if resp and resp.get("job_id"):
-                        return f"Enqueued regenerate job {resp.get('job_id')}"
-                    return "failed to enqueue regenerate"
-
-                use_img2img_btn.click(fn=_use_img2img, inputs=[path_state], outputs=[status_area])
-                use_var_btn.click(fn=_use_variations, inputs=[path_state], outputs=[status_area])
-                # Pass the filename textbox to _show_json (robust when path state is empty)
-                show_json_btn.click(fn=_show_json, inputs=[name_tb], outputs=[status_area])
-                regen_btn.click(fn=_regenerate, inputs=[path_state], outputs=[status_area])
-                def _archive(path):
-                    if not path:
-                        return "(no file)"
-                    name = os.path.basename(path)
-                    api_path = f"/api/results/{urllib.parse.quote(name)}/archive"
-                    resp = _api_post(api_path, {})
-                    if resp and resp.get("archived"):
-                        return f"Archived {name}"
-                    return f"Failed to archive {name}"
-
-                archive_btn.click(fn=_archive, inputs=[path_state], outputs=[status_area])
-
-        # Bottom navigation (same as top)
-        with gr.Row():
-            prev_btn_bottom = gr.Button("←", scale=0, min_width=50)
-            page_indicator_bottom = gr.Markdown("Page 1")
-            next_btn_bottom = gr.Button("→", scale=0, min_width=50)
-
-        def _populate_page(page_index: int, show_failed_filter: bool):
-            try:
-                try:
-                    payload = _api_get("/api/results/paged", {"page": page_index, "size": PAGE_SIZE})
-                except Exception:
-                    payload = None
+                        # fallback to local listing
+                        entries = _list_results_paths()
+                        total = len(entries)
+                        start = page_index * PAGE_SIZE
+                        page_entries = entries[start : start + PAGE_SIZE]
+                        # Header reads are I/O bound and release the GIL; check the page window on the pool
+                        valid = _IO_POOL.map(lambda e: _is_valid_image(e.path, e.size), page_entries)
+                        page_entries = [e for e, ok in zip(page_entries, valid) if ok]
+                        src_paths = [e.path for e in page_entries]
+                        page_paths = list(_IO_POOL.map(_thumbnail_for, src_paths))
+                        previews = list(_IO_POOL.map(_preview_for, src_paths))
+                        # build out_values using minimal info
+                        page_text = f"Page {page_index + 1} of {max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)}"
+                        rows = [
+                            (_slot_html(preview, e.path), e.name, _fmt_mtime(e.mtime), "", "", e.path, _derive_json_name(e.name))
+                            for e, preview in zip(page_entries, previews)
+                        ]
+                        rows += [_EMPTY_ROW] * (PAGE_SIZE - len(rows))
+                        return (page_paths, page_index, total, page_text, page_text, *chain.from_iterable(rows))
+
+                    # Get local file paths instead of URLs for gallery (Gradio doesn't like 127.0.0.1 URLs)
+
+                    # Ensure a placeholder image exists for missing files (so cards aren't blank)
+                    results_path = _results_dir()
+                    placeholder_path = os.path.join(results_path, ".missing.png")
+                    try:
+                        if not os.path.exists(placeholder_path):
+                            # create a simple gray placeholder
+                            ph = Image.new("RGB", (512, 512), color=(180, 180, 180))
+                            ph.save(placeholder_path, format="PNG")
+                            ph.close()
+                    except Exception:
+                        if DEBUG_ENABLED:
+                            print("[DEBUG-UI] failed to create placeholder image")
+
+                    total_results = payload.get("total", 0)
+                    page_text = f"Page {page_index + 1} of {max(1, (total_results + PAGE_SIZE - 1) // PAGE_SIZE)}"
+                    items = payload.get("results", [])[:PAGE_SIZE]
+                    # Per-slot stat + header reads are independent I/O; run them concurrently
+                    built = list(_IO_POOL.map(
+                        lambda item: _build_row(item, results_path, placeholder_path, show_failed_filter),
+                        items,
+                    ))
+                    rows = [row for _, row in built] + [_EMPTY_ROW] * (PAGE_SIZE - len(built))
+                    # Gallery shows cached thumbnails; path_state keeps the full-resolution file.
+                    # Gradio Gallery cannot accept None entries; filter them for the gallery view
+                    gallery_paths = [g for g, _ in built if g]
+                    if (page_index + 1) * PAGE_SIZE < total_results:
+                        _prefetch_page(page_index + 1, PAGE_SIZE, results_path)
+                    return (gallery_paths, page_index, total_results, page_text, page_text, *chain.from_iterable(rows))
+                except Exception as e:
+                    # Catch-all to prevent Gradio from showing "Error" in the UI.
                     if DEBUG_ENABLED:
                         import traceback
-                        print("[DEBUG-UI] exception calling _api_get:")
+                        print("[DEBUG-UI] exception in _populate_page:")
                         traceback.print_exc()
+                    # Build an empty safe response matching the expected outputs
+                    page_text = f"Page {page_index + 1} of 1"
+                    return ([], page_index, 0, page_text, page_text, *(_EMPTY_ROW * PAGE_SIZE))
+
+            def _render(page_index: int, show_failed_filter: bool, last_values):
+                # Only outputs that differ from what this session was last sent are updated
+                values = _populate_page(page_index, show_failed_filter)
+                if last_values is None or len(last_values) != len(values):
+                    return (*values, values)
+                return (*(gr.skip() if v == old else v for v, old in zip(values, last_values)), values)
+
+            def _prev(page_index: int, show_failed_filter: bool, last_values):
+                new_page = max(0, page_index - 1)
+                return _render(new_page, show_failed_filter, last_values)
+
+            def _next(page_index: int, total: int, show_failed_filter: bool, last_values):
+                max_page = max(0, (total - 1) // PAGE_SIZE)
+                new_page = min(max_page, page_index + 1)
+                return _render(new_page, show_failed_filter, last_values)
+
+            # wire pagination controls: outputs are files_gallery, page_state, total_state, page_indicator (top & bottom) + per-slot component values
+            outputs = [files_gallery, page_state, total_state, page_indicator, page_indicator_bottom]
+            for i in range(PAGE_SIZE):
+                outputs.extend([image_slots[i], name_slots[i], mtime_slots[i], prompt_slots[i], model_slots[i], path_states[i], json_name_states[i]])
+            # Every page render also records the values it sent, for diffing the next one
+            outputs.append(last_values_state)
+
+            # Wire all navigation buttons
+            prev_btn_top.click(fn=_prev, inputs=[page_state, show_failed, last_values_state], outputs=outputs)
+            next_btn_top.click(fn=_next, inputs=[page_state, total_state, show_failed, last_values_state], outputs=outputs)
+            prev_btn_bottom.click(fn=_prev, inputs=[page_state, show_failed, last_values_state], outputs=outputs)
+            next_btn_bottom.click(fn=_next, inputs=[page_state, total_state, show_failed, last_values_state], outputs=outputs)
+
+            # Wire filter toggle
+            show_failed.change(fn=_render, inputs=[page_state, show_failed, last_values_state], outputs=outputs)
+
+            def _tick(page_index: int, show_failed_filter: bool, last_version, last_values, interval: int):
+                # The API's ETag tracks its own listing (directory and index); a tick costs one
+                # conditional request while it is unchanged and only then rebuilds the page
+                if API_BASE:
+                    version = _listing_etag(page_index, PAGE_SIZE)
+                else:
+                    try:
+                        version = os.stat(_results_dir()).st_mtime_ns
+                    except OSError:
+                        version = None
+                # An unknown version (API unreachable) counts as unchanged once a page is shown
+                if last_values is not None and (version is None or version == last_version):
+                    # Idle: double the interval up to _POLL_MAX
+                    backed_off = min(interval * 2, _POLL_MAX)
+                    if backed_off == interval:
+                        return (gr.skip(),) * (len(outputs) + 3)
+                    return (*(gr.skip(),) * (len(outputs) + 1), gr.Timer(value=backed_off), backed_off)
+                # New or removed files: don't serve a cached page from before the change
+                _invalidate_paged_cache()
+                timer_update = gr.Timer(value=_POLL_MIN) if interval != _POLL_MIN else gr.skip()
+                return (*_render(page_index, show_failed_filter, last_values), version, timer_update, _POLL_MIN)
+
+            tick_inputs = [page_state, show_failed, listing_version_state, last_values_state, interval_state]
+            tick_outputs = outputs + [listing_version_state, timer, interval_state]
+            # Wire timer refresh
+            timer.tick(fn=_tick, inputs=tick_inputs, outputs=tick_outputs)
+            results_changed.change(fn=_tick, inputs=tick_inputs, outputs=tick_outputs)
+
+            # Initialize on load
+            results_block.load(fn=_tick, inputs=tick_inputs, outputs=tick_outputs)
+            results_block.load(fn=None, js=_RESULTS_JS)
+
+            def _timer_mode(visible: bool, live: bool):
+                return gr.Timer(value=_POLL_MIN, active=visible and not live), _POLL_MIN
+
+            for box in (tab_visible, sse_live):
+                box.change(fn=_timer_mode, inputs=[tab_visible, sse_live], outputs=[timer, interval_state])
 
-                if not payload:
-                    # fallback to local listing
-                    paths = _list_results_paths()
-                    total = len(paths)
-                    start = page_index * PAGE_SIZE
-                    page_paths = paths[start : start + PAGE_SIZE]
-                    # build out_values using minimal info
-                    page_text = f"Page {page_index + 1} of {max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)}"
-                    out = [page_paths, page_index, page_text, page_text]
-                    for i in range(PAGE_SIZE):
-                        if i < len(page_paths):
-                            p = page_paths[i]
-                            name = os.path.basename(p)
-                            stat = os.stat(p)
-                            m = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat.st_mtime))
-                            out.extend([p, name, m, "", "", p])
-                        else:
-                            out.extend([None, "", "", "", "", ""])
-                    return tuple(out)
-
-                # Get local file paths instead of URLs for gallery (Gradio doesn't like 127.0.0.1 URLs)
-                results_path = app_settings.settings.generated_images.path
-                if not results_path:
-                    from paths import FastStableDiffusionPaths
-                    results_path = FastStableDiffusionPaths.get_results_path()
-
-                # Ensure a placeholder image exists for missing files (so cards aren't blank)
-                placeholder_path = os.path.join(results_path, ".missing.png")
-                try:
-                    if not os.path.exists(placeholder_path):
-                        # create a simple gray placeholder
-                        ph = Image.new("RGB", (512, 512), color=(180, 180, 180))
-                        ph.save(placeholder_path, format="PNG")
-                        ph.close()
-                except Exception:
-                    if DEBUG_ENABLED:
-                        print("[DEBUG-UI] failed to create placeholder image")
-
-                page_paths = []
-                total_results = payload.get("total", 0)
-                page_text = f"Page {page_index + 1} of {max(1, (total_results + PAGE_SIZE - 1) // PAGE_SIZE)}"
-                out = [page_index, page_text, page_text]
-                for i in range(PAGE_SIZE):
-                    if i < len(payload.get("results", [])):
-                        item = payload["results"][i]
-                        name = item.get("name")
-                        # Prefer cache-busted HTTP URL to force browser reloads
-                        local_path = os.path.join(results_path, name)
-                        file_exists = False
-                        image_url = None
-                        try:
-                            if os.path.exists(local_path):
-                                st = os.stat(local_path)
-                                if st.st_size > 16:
-                                    # quick header check
-                                    try:
-                                        with open(local_path, "rb") as fh:
-                                            prefix = fh.read(8)
-                                        if prefix.startswith(b"\x89PNG\r\n\x1a\n") or prefix.startswith(b"\xff\xd8"):
-                                            file_exists = True
-                                            image_url = local_path
-                                        else:
-                                            if DEBUG_ENABLED:
-                                                print(f"[DEBUG-UI] skipping result with bad header: {local_path}")
-                                    except Exception:
-                                        if DEBUG_ENABLED:
-                                            print(f"[DEBUG-UI] couldn't read header for: {local_path}")
-                                else:
-                                    if DEBUG_ENABLED:
-                                        print(f"[DEBUG-UI] skipping result too small: {local_path} ({st.st_size} bytes)")
-                        except Exception:
-                            file_exists = False
-                        if DEBUG_ENABLED:
-                            print(f"[DEBUG-UI] Image {i}: name={name}, path={local_path}, exists={file_exists}")
-                        
-                        # Filter out missing files if show_failed is False
-                        if not show_failed_filter and not file_exists:
-                            out.extend([None, "", "", "", "", ""])
-                            continue
-                        
-                        mtime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(item.get("mtime", 0)))
-                        prompt_val = item.get("meta", {}).get("prompt", "")
-                        model_val = item.get("meta", {}).get("model", "") or item.get("meta", {}).get("openvino_model", "")
-                        if DEBUG_ENABLED:
-                            print(f"[DEBUG-UI]   prompt={prompt_val[:50] if prompt_val else 'EMPTY'}, model={model_val}")
-                        # For the gallery, only include real files. For the per-slot image display,
-                        # show a placeholder when the real file is missing to avoid blank cards.
-                        display_image = image_url if file_exists else placeholder_path
-                        page_paths.append(image_url if file_exists else None)
-                        out.extend([display_image, name if file_exists else f"{name} (missing)", mtime, prompt_val, model_val, local_path if file_exists else ""])
-                    else:
-                        out.extend([None, "", "", "", "", ""]) 
-
-                # Gradio Gallery cannot accept None entries; filter them for the gallery view
-                gallery_paths = [p for p in page_paths if p]
-                return tuple([gallery_paths] + out)
-            except Exception as e:
-                # Catch-all to prevent Gradio from showing "Error" in the UI.
-                if DEBUG_ENABLED:
-                    import traceback
-                    print("[DEBUG-UI] exception in _populate_page:")
-                    traceback.print_exc()
-                # Build an empty safe response matching the expected outputs
-                page_paths = []
-                page_text = f"Page {page_index + 1} of 1"
-                safe = [page_paths, page_index, page_text, page_text]
-                for _ in range(PAGE_SIZE):
-                    safe.extend([None, "", "", "", "", ""])
-                return tuple(safe)
-
-        def _prev(page_index: int, show_failed_filter: bool):
-            new_page = max(0, page_index - 1)
-            return _populate_page(new_page, show_failed_filter)
-
-        def _next(page_index: int, show_failed_filter: bool):
-            paths = _list_results_paths()
-            max_page = max(0, (len(paths) - 1) // PAGE_SIZE)
-            new_page = min(max_page, page_index + 1)
-            return _populate_page(new_page, show_failed_filter)
-
-        # wire pagination controls: outputs are files_gallery, page_state, page_indicator (top & bottom) + per-slot component values
-        outputs = [files_gallery, page_state, page_indicator, page_indicator_bottom]
-        for i in range(PAGE_SIZE):
-            outputs.extend([image_slots[i], name_slots[i], mtime_slots[i], prompt_slots[i], model_slots[i], path_states[i]])
-        
-        # Wire all navigation buttons
-        prev_btn_top.click(fn=_prev, inputs=[page_state, show_failed], outputs=outputs)
-        next_btn_top.click(fn=_next, inputs=[page_state, show_failed], outputs=outputs)
-        prev_btn_bottom.click(fn=_prev, inputs=[page_state, show_failed], outputs=outputs)
-        next_btn_bottom.click(fn=_next, inputs=[page_state, show_failed], outputs=outputs)
-        
-        # Wire filter toggle
-        show_failed.change(fn=_populate_page, inputs=[page_state, show_failed], outputs=outputs)
-        
-        # Wire timer refresh
-        timer.tick(fn=_populate_page, inputs=[page_state, show_failed], outputs=outputs)
-
-        # Initialize on load
-        results_block.load(fn=_populate_page, inputs=[page_state, show_failed], outputs=outputs)
-    
     return results_block
@@ -4,23 +4,113 @@ from backend.models.lcmdiffusion_setting import DiffusionTask
 from models.interface_types import InterfaceType
 from constants import DEVICE
 from state import get_settings, get_context
-from frontend.utils import is_reshape_required, get_valid_lora_model
+from frontend.utils import ReshapeTracker, get_valid_lora_model
 from backend.lora import get_lora_models
-from concurrent.futures import ThreadPoolExecutor
-import json
-import urllib.request
-import urllib.parse
+from backend.base64_image import pil_image_to_base64_str
+import orjson
 import os
+import errno
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+import httpx
 
 API_BASE = os.environ.get("API_URL", "http://127.0.0.1:8000")  # default to API server
 from frontend.webui.errors import show_error
 
 app_settings = get_settings()
 
-previous_width = 0
-previous_height = 0
-previous_model_id = ""
-previous_num_of_images = 0
+# The local pipeline is shared by every session, so its compiled shape is tracked once per process
+_reshape_tracker = ReshapeTracker()
+
+_POST_ATTEMPTS = 3
+# Gateway/unavailable responses mean the API never took the job, so they are safe to retry
+_RETRY_STATUSES = (502, 503, 504)
+
+# Set when a POST is refused, so clicks right after skip the round trip to a stopped API
+_PROBE_TTL = 2.0
+_probe_cache = {"ts": 0.0, "refused": False}
+
+
+def _api_refusing() -> bool:
+    """True when a recent POST to the API was refused (server not running)."""
+    if not _probe_cache["refused"]:
+        return False
+    return time.monotonic() - _probe_cache["ts"] < _PROBE_TTL
+
+# Jobs enqueued in the last few seconds keyed by payload digest, so a burst of
+# clicks with identical settings maps to one job instead of duplicate runs
+_DEDUP_TTL = 2.0
+_DEDUP_MAX = 32
+_recent_jobs: "OrderedDict[bytes, tuple]" = OrderedDict()
+_recent_lock = threading.Lock()
+
+# ECONNREFUSED, plus WinError 10061 (WSAECONNREFUSED) for the Windows launchers
+_REFUSED_ERRNOS = (errno.ECONNREFUSED, 10061)
+
+# Keep-alive client so repeated enqueues reuse one connection to the API server
+_CLIENT = httpx.Client(
+    timeout=httpx.Timeout(5.0, connect=2.0),
+    limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+)
+
+
+def _connection_refused(e: httpx.ConnectError) -> bool:
+    # httpx wraps httpcore's ConnectError, which wraps the socket OSError; find that one
+    exc = e
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, OSError):
+            return isinstance(exc, ConnectionRefusedError) or exc.errno in _REFUSED_ERRNOS
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _post_queue(url: str, body: bytes) -> dict:
+    """POST a job to the API queue, retrying only failures that cannot have queued it.
+
+    The POST is not idempotent: connect failures and gateway 502/503/504 are retried,
+    but read timeouts, dropped connections and other 5xx return at once since the
+    server may already have the job. A refused connection is re-raised so the caller
+    can fall back to local generation.
+    """
+    for attempt in range(1, _POST_ATTEMPTS + 1):
+        try:
+            resp = _CLIENT.post(url, content=body, headers={"Content-Type": "application/json"})
+        except httpx.ConnectError as e:
+            if _connection_refused(e):
+                raise
+            if attempt == _POST_ATTEMPTS:
+                return {"error": str(e), "attempts": attempt}
+        except httpx.ConnectTimeout as e:
+            if attempt == _POST_ATTEMPTS:
+                return {"error": str(e) or type(e).__name__, "attempts": attempt}
+        except httpx.TransportError as e:
+            # Sent but unanswered (read timeout, dropped connection): don't risk a duplicate job
+            return {"error": str(e) or type(e).__name__, "attempts": attempt}
+        else:
+            if resp.is_success:
+                return orjson.loads(resp.content)
+            if resp.status_code not in _RETRY_STATUSES or attempt == _POST_ATTEMPTS:
+                return {"error": f"HTTPError: {resp.status_code} {resp.text}", "attempts": attempt}
+        time.sleep(0.1 * 2 ** (attempt - 1))
+
+
+@lru_cache(maxsize=8)
+def _lora_models_cached(models_dir: str, dir_mtime_ns: int) -> dict:
+    return get_lora_models(models_dir)
+
+
+def _lora_models(models_dir: str) -> dict:
+    """get_lora_models, rescanned only when the models directory's mtime changes."""
+    try:
+        dir_mtime_ns = os.stat(models_dir).st_mtime_ns
+    except OSError:
+        return {}
+    return _lora_models_cached(models_dir, dir_mtime_ns)
 
 
 def generate_text_to_image(
@@ -28,12 +118,7 @@ def generate_text_to_image(
     neg_prompt,
 ) -> Any:
     context = get_context(InterfaceType.WEBUI)
-    global \
-        previous_height, \
-        previous_width, \
-        previous_model_id, \
-        previous_num_of_images, \
-        app_settings
+    global app_settings
     app_settings.settings.lcm_diffusion_setting.prompt = prompt
     app_settings.settings.lcm_diffusion_setting.negative_prompt = neg_prompt
     app_settings.settings.lcm_diffusion_setting.diffusion_task = (
@@ -45,91 +130,78 @@ def generate_text_to_image(
     image_height = app_settings.settings.lcm_diffusion_setting.image_height
     num_images = app_settings.settings.lcm_diffusion_setting.number_of_images
     if app_settings.settings.lcm_diffusion_setting.use_openvino:
-        reshape = is_reshape_required(
-            previous_width,
-            image_width,
-            previous_height,
-            image_height,
-            previous_model_id,
-            model_id,
-            previous_num_of_images,
-            num_images,
-        )
+        reshape = _reshape_tracker.is_required(image_width, image_height, model_id, num_images)
 
     def _enqueue():
         cfg = app_settings.settings.lcm_diffusion_setting
         
         # Convert PIL Image to base64 if present (needed for JSON serialization)
         if cfg.init_image and hasattr(cfg.init_image, 'mode'):  # Check if it's a PIL Image
-            from backend.base64_image import pil_image_to_base64_str
             cfg.init_image = pil_image_to_base64_str(cfg.init_image)
         
-        # if no API configured, run local generation directly
-        if not API_BASE:
+        def _run_local():
             try:
-                imgs = context.generate_text_to_image(app_settings.settings)
+                imgs = context.generate_text_to_image(app_settings.settings, reshape, DEVICE)
                 if imgs:
                     saved = context.save_images(imgs, app_settings.settings)
                     return {"local": True, "saved": saved}
                 return {"error": "local generation produced no images"}
             except Exception as le:
                 return {"error": f"local generation failed: {le}"}
-        # pydantic v2 -> model_dump, fallback to dict()
+
+        # No API configured, or the API server isn't running: generate locally without
+        # building the JSON payload at all
+        if not API_BASE or _api_refusing():
+            return _run_local()
+        # pydantic v2 serializes straight to JSON in one native pass; fall back to dict() + orjson
         try:
-            payload = cfg.model_dump()
+            body = cfg.model_dump_json().encode("utf-8")
         except Exception:
             try:
                 payload = cfg.dict()
             except Exception:
                 payload = {}
+            body = orjson.dumps(payload)
         url = API_BASE.rstrip("/") + "/api/queue"
-        body = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        now = time.monotonic()
+        with _recent_lock:
+            hit = _recent_jobs.get(digest)
+            if hit and now - hit[1] < _DEDUP_TTL:
+                return {"job_id": hit[0]}
         try:
-            with urllib.request.urlopen(req, timeout=5) as resp:
-                return json.load(resp)
-        except urllib.error.HTTPError as e:
-            try:
-                body = e.read().decode('utf-8')
-            except Exception:
-                body = str(e)
-            return {"error": f"HTTPError: {e.code} {body}"}
-        except urllib.error.URLError as e:
+            resp = _post_queue(url, body)
+            if resp and resp.get("job_id"):
+                with _recent_lock:
+                    _recent_jobs[digest] = (resp["job_id"], now)
+                    _recent_jobs.move_to_end(digest)
+                    while len(_recent_jobs) > _DEDUP_MAX:
+                        _recent_jobs.popitem(last=False)
+            return resp
+        except httpx.ConnectError as e:
             # Connection refused -> run local generation as fallback
-            reason = getattr(e, "reason", None)
-            msg = str(e)
-            if (isinstance(reason, ConnectionRefusedError)) or (hasattr(reason, "errno") and getattr(reason, "errno") == 111) or ("Connection refused" in msg):
-                # run generation locally (we are already in a thread)
-                try:
-                    imgs = context.generate_text_to_image(app_settings.settings)
-                    if imgs:
-                        saved = context.save_images(imgs, app_settings.settings)
-                        return {"local": True, "saved": saved}
-                    return {"error": "local generation produced no images"}
-                except Exception as le:
-                    return {"error": f"local generation failed: {le}"}
+            if _connection_refused(e):
+                _probe_cache.update(ts=time.monotonic(), refused=True)
+                return _run_local()
             return {"error": str(e)}
         except Exception as e:
             return {"error": str(e)}
 
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(_enqueue)
-        resp = future.result()
-        if resp and resp.get("job_id"):
-            return [], f"Enqueued job {resp.get('job_id')}"
-        elif resp and resp.get("local"):
-            saved = resp.get("saved") or []
-            return [], f"Ran locally, saved: {saved}"
-        else:
-            err = resp.get("error") if resp else "failed to enqueue"
-            show_error(err)
-            return None, f"Error: {err}"
-
-    previous_width = image_width
-    previous_height = image_height
-    previous_model_id = model_id
-    previous_num_of_images = num_images
-    return images
+    # Gradio already runs this handler on a worker thread; call _enqueue inline
+    resp = _enqueue()
+    if resp and resp.get("job_id"):
+        return [], f"Enqueued job {resp.get('job_id')}"
+    elif resp and resp.get("local"):
+        # The local pipeline is now compiled for these settings; only a change needs a reshape
+        _reshape_tracker.update(image_width, image_height, model_id, num_images)
+        saved = resp.get("saved") or []
+        return [], f"Ran locally, saved: {saved}"
+    else:
+        err = resp.get("error") if resp else "failed to enqueue"
+        if resp and resp.get("attempts", 1) > 1:
+            err = f"{err} (after {resp['attempts']} attempts)"
+        show_error(err)
+        return None, f"Error: {err}"
 
 
 def get_text_to_image_ui() -> None:
@@ -157,7 +229,7 @@ def get_text_to_image_ui() -> None:
                 )
 
                 # LoRA controls (local to this generation)
-                lora_models_map = get_lora_models(
+                lora_models_map = _lora_models(
                     app_settings.settings.lcm_diffusion_setting.lora.models_dir
                 )
                 valid_model = get_valid_lora_model(
@@ -171,12 +243,14 @@ def get_text_to_image_ui() -> None:
                     value=app_settings.settings.lcm_diffusion_setting.lora.enabled,
                     interactive=True,
                 )
-                lora_model = gr.Dropdown(
-                    lora_choices,
-                    label="LoRA model",
-                    value=(valid_model if valid_model != "" else "None"),
-                    interactive=True,
-                )
+                with gr.Row():
+                    lora_model = gr.Dropdown(
+                        lora_choices,
+                        label="LoRA model",
+                        value=(valid_model if valid_model != "" else "None"),
+                        interactive=True,
+                    )
+                    lora_refresh_btn = gr.Button("↻", scale=0, min_width=50)
                 lora_weight = gr.Slider(
                     0.0,
                     1.0,
@@ -198,12 +272,10 @@ def get_text_to_image_ui() -> None:
     def _wrap_generate(prompt, neg_prompt, lora_enabled_val, lora_model_val, lora_weight_val):
         # Apply LoRA selection to settings for this generation
         if app_settings.settings.lcm_diffusion_setting.use_openvino and lora_enabled_val:
-            from frontend.webui.errors import show_error as _show_err
-
-            _show_err("LoRA is not supported in OpenVINO mode.")
+            show_error("LoRA is not supported in OpenVINO mode.")
             return None, "Error: LoRA not supported in OpenVINO"
 
-        lora_models_map_local = get_lora_models(
+        lora_models_map_local = _lora_models(
             app_settings.settings.lcm_diffusion_setting.lora.models_dir
         )
         if lora_model_val != "None":
@@ -216,6 +288,16 @@ def get_text_to_image_ui() -> None:
 
         return generate_text_to_image(prompt, neg_prompt)
 
+    def _refresh_lora_models(current):
+        # Force a rescan; the mtime check misses files added inside existing subfolders
+        _lora_models_cached.cache_clear()
+        choices = ["None"] + list(
+            _lora_models(app_settings.settings.lcm_diffusion_setting.lora.models_dir).keys()
+        )
+        return gr.update(choices=choices, value=current if current in choices else "None")
+
+    lora_refresh_btn.click(fn=_refresh_lora_models, inputs=[lora_model], outputs=[lora_model])
+
     generate_btn.click(
         fn=_wrap_generate,
         inputs=input_params,
@@ -1,4 +1,6 @@
 from datetime import datetime
+from functools import lru_cache
+import shutil
 import subprocess
 import os
 
@@ -20,7 +22,11 @@ from state import get_settings
 app_settings = get_settings()
 
 
+@lru_cache(maxsize=None)
 def _get_git_commit() -> str:
+    # HEAD doesn't move under a running process; fork git at most once
+    if shutil.which("git") is None:
+        return "unknown"
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--short", "HEAD"],
@@ -73,7 +79,11 @@ def get_web_ui() -> gr.Blocks:
     with gr.Blocks(
         title="FastSD CPU",
         theme=theme,
-        css="footer {visibility: hidden}",
+        # .hidden-signal: tab checkboxes clicked from JS; they must stay in the DOM, so CSS hides them
+        css="footer {visibility: hidden} .hidden-signal {display: none !important}",
+        # Hourly sweep of Gradio's file cache (gallery thumbnails, img2img uploads).
+        # Only the launched Blocks honours this, so it lives here rather than on the tabs.
+        delete_cache=(3600, 3600),
     ) as fastsd_web_ui:
         gr.HTML("<center><h2>Image Generator 3d Pro Max Mini Micro Manic</h2></center>")
         with gr.Row():
@@ -132,5 +142,7 @@ def start_webui(
     share: bool = False,
 ):
     webui = get_web_ui()
-    webui.queue()
+    # Bound pending events so a burst of clicks is rejected instead of queuing without limit.
+    # Per-event concurrency stays at Gradio's default of 1; local generation shares one pipeline.
+    webui.queue(max_size=16)
     webui.launch(server_name="0.0.0.0", share=share)
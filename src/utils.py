@@ -1,8 +1,8 @@
-from os import path, listdir
 import platform
 import os
 import time
 import logging
+from functools import lru_cache
 from typing import List
 
 logger = logging.getLogger(__name__)
@@ -18,13 +18,9 @@ def show_system_info():
 
 
 def get_models_from_text_file(file_path: str) -> List:
-    models = []
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-    for repo_id in lines:
-        if repo_id.strip() != "":
-            models.append(repo_id.strip())
-    return models
+    with open(file_path, "r", encoding="utf-8") as file:
+        # One strip per line; blank lines drop out of the filter
+        return list(filter(None, (line.strip() for line in file)))
 
 
 def get_image_file_extension(image_format: str) -> str:
@@ -35,24 +31,52 @@ def get_image_file_extension(image_format: str) -> str:
 
 
 def get_files_in_dir(root_dir: str) -> List:
-    models = []
-    models.append("None")
-    for file in listdir(root_dir):
-        if file.endswith((".gguf", ".safetensors")):
-            models.append(path.join(root_dir, file))
+    models = ["None"]
+    # DirEntry carries the file type from the directory read, so is_file() needs no stat
+    with os.scandir(root_dir) as it:
+        for entry in it:
+            if entry.name.endswith((".gguf", ".safetensors")) and entry.is_file():
+                models.append(entry.path)
     return models
 
 
-def atomic_save_image(image, dest_path: str, jpeg_quality: int = 90, save_kwargs: dict | None = None, max_attempts: int = 3) -> bool:
+@lru_cache(maxsize=4096)
+def format_timestamp(ts: float) -> str:
+    """Local-time display string for an epoch timestamp (queue job times)."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+# PIL format names for destination extensions atomic_save_image may be given
+_SAVE_FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".gif": "GIF"}
+# Image header prefixes treated as a valid file: PNG, JPEG, GIF. Shared by the
+# save validation here and the results listings.
+IMAGE_MAGIC = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8", b"GIF89a", b"GIF87a")
+_PERMANENT_SAVE_ERRORS = (ValueError, KeyError, PermissionError, IsADirectoryError, NotADirectoryError)
+
+
+def flush_dir(dir_path: str) -> None:
+    """fsync a directory so renames into it are durable; best effort."""
+    try:
+        dir_fd = os.open(dir_path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except Exception:
+        pass
+
+
+def atomic_save_image(image, dest_path: str, jpeg_quality: int = 90, save_kwargs: dict | None = None, max_attempts: int = 3, sync: bool = True) -> bool:
     """
     Atomically save a PIL Image to disk with validation.
 
     - Writes to a hidden temp file, fsyncs, validates magic header and size,
       then atomically replaces the final file.
+    - With sync=False the directory fsync is skipped; callers saving a batch
+      call flush_dir() once afterwards. The file itself is always fsynced.
     - Returns True on success, False otherwise.
     """
-    if save_kwargs is None:
-        save_kwargs = {}
+    save_kwargs = dict(save_kwargs or {})
 
     out_dir = os.path.dirname(dest_path) or "."
     os.makedirs(out_dir, exist_ok=True)
@@ -65,6 +89,9 @@ def atomic_save_image(image, dest_path: str, jpeg_quality: int = 90, save_kwargs
     ext = os.path.splitext(dest_path)[1].lower()
     if ext in (".jpg", ".jpeg"):
         save_kwargs.setdefault("quality", jpeg_quality)
+    # The temp file ends in ".tmp", so PIL can't infer the format from its name
+    if ext in _SAVE_FORMATS:
+        save_kwargs.setdefault("format", _SAVE_FORMATS[ext])
 
     attempts = 0
     saved_ok = False
@@ -84,35 +111,28 @@ def atomic_save_image(image, dest_path: str, jpeg_quality: int = 90, save_kwargs
                     os.remove(temp_path)
             except Exception:
                 pass
-            time.sleep(0.1)
+            # Bad format/arguments or permissions won't change on retry
+            if isinstance(e, _PERMANENT_SAVE_ERRORS):
+                return False
+            time.sleep(0.05 * 2 ** attempts)
             continue
 
-        # Flush and sync temp file
+        # Sync and validate through one descriptor: size, magic header (PNG/JPEG/GIF), fsync
         try:
-            with open(temp_path, "rb") as tf:
-                tf.flush()
+            fd = os.open(temp_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                size = os.fstat(fd).st_size
+                prefix = os.read(fd, 8)
                 try:
-                    os.fsync(tf.fileno())
-                except Exception:
+                    os.fsync(fd)
+                except OSError:
                     pass
-        except Exception:
-            pass
-
-        # Quick validation: non-empty and magic header (PNG/JPEG/GIF)
-        try:
-            stat_tmp = os.stat(temp_path)
-            if stat_tmp.st_size > 16:
-                with open(temp_path, "rb") as hf:
-                    prefix = hf.read(8)
-                if (
-                    prefix.startswith(b"\x89PNG\r\n\x1a\n")
-                    or prefix.startswith(b"\xff\xd8")
-                    or prefix.startswith(b"GIF89a")
-                    or prefix.startswith(b"GIF87a")
-                ):
-                    saved_ok = True
-                    break
-        except Exception:
+            finally:
+                os.close(fd)
+            if size > 16 and prefix.startswith(IMAGE_MAGIC):
+                saved_ok = True
+                break
+        except OSError:
             pass
 
         try:
@@ -120,33 +140,26 @@ def atomic_save_image(image, dest_path: str, jpeg_quality: int = 90, save_kwargs
                 os.remove(temp_path)
         except Exception:
             pass
-        time.sleep(0.1)
+        time.sleep(0.05 * 2 ** attempts)
 
     if not saved_ok:
         logger.error("atomic_save_image failed to produce valid temp file for %s after %d attempts", dest_path, max_attempts)
         return False
 
     # Promote to final filename
+    # os.replace overwrites atomically on every platform; os.rename adds nothing here
     try:
         os.replace(temp_path, dest_path)
-    except Exception:
+    except OSError as e:
+        logger.error("atomic promotion failed for %s: %s", dest_path, e)
         try:
-            os.rename(temp_path, dest_path)
-        except Exception as e:
-            logger.error("atomic promotion failed for %s: %s", dest_path, e)
-            try:
-                if os.path.exists(dest_path):
-                    os.remove(dest_path)
-            except Exception:
-                pass
-            return False
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
 
-    # Sync directory so file becomes visible
-    try:
-        dir_fd = os.open(out_dir, os.O_RDONLY)
-        os.fsync(dir_fd)
-        os.close(dir_fd)
-    except Exception:
-        pass
+    # Sync directory so the rename survives a crash
+    if sync:
+        flush_dir(out_dir)
 
     return True